@@ -2,12 +2,33 @@
 调试脚本 - 检查数据库中的表信息和数据内容
 """
 
+import argparse
 import asyncio
 import aiosqlite
 from pathlib import Path
 
-async def show_database_tables():
-    """显示数据库中的表信息和数据内容"""
+# 逐批读取查询结果时每批的行数
+FETCH_BATCH_SIZE = 256
+
+# layer_resources表默认显示的记录数
+DEFAULT_DISPLAY_LIMIT = 50
+
+def positive_int(value: str) -> int:
+    """argparse类型：解析不小于1的整数"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"不是有效的整数: {value}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"必须是不小于1的整数: {value}")
+    return number
+
+async def show_database_tables(limit: int = DEFAULT_DISPLAY_LIMIT):
+    """显示数据库中的表信息和数据内容
+    
+    Args:
+        limit: layer_resources表最多显示的记录数
+    """
     db_path = Path("data/ogc_layers.db")
     
     if not db_path.exists():
@@ -27,9 +48,9 @@ async def show_database_tables():
         print("=" * 80)
         
         for (table_name,) in tables:
-            await show_table_details(conn, table_name)
+            await show_table_details(conn, table_name, limit)
 
-async def show_table_details(conn, table_name):
+async def show_table_details(conn, table_name, limit):
     """显示单个表的详细信息和数据内容"""
     print(f"\n表名: {table_name}")
     print("-" * 60)
@@ -45,7 +66,7 @@ async def show_table_details(conn, table_name):
         
         # 如果是layer_resources表，只显示关键字段
         if table_name == 'layer_resources':
-            await show_layer_resources_data(conn)
+            await show_layer_resources_data(conn, limit, count)
         else:
             # 其他表显示所有字段
             await show_all_table_data(conn, table_name)
@@ -54,19 +75,30 @@ async def show_table_details(conn, table_name):
     
     print("\n" + "=" * 80)
 
-async def show_layer_resources_data(conn):
-    """显示layer_resources表的关键数据"""
+async def show_layer_resources_data(conn, limit, total):
+    """显示layer_resources表的关键数据
+    
+    Args:
+        conn: 数据库连接
+        limit: 最多显示的记录数
+        total: 表中的总记录数
+    """
     cursor = await conn.execute("""
         SELECT service_name, service_url, service_type, layer_name
         FROM layer_resources 
         ORDER BY service_name, service_type, layer_name
-    """)
-    rows = await cursor.fetchall()
+        LIMIT ?
+    """, (limit,))
+    # 分批读取结果，避免一次性加载全表
+    cursor.arraysize = FETCH_BATCH_SIZE
     
+    print(f"显示 {min(limit, total)} / {total} 条记录")
     print(f"{'序号':<4} {'服务名':<20} {'服务类型':<8} {'图层名':<25} {'服务URL'}")
     print("-" * 100)
     
-    for i, (service_name, service_url, service_type, layer_name) in enumerate(rows, 1):
+    i = 0
+    async for service_name, service_url, service_type, layer_name in cursor:
+        i += 1
         # 截断过长的字段以保持格式整齐
         service_name_short = service_name[:18] + ".." if len(service_name) > 20 else service_name
         layer_name_short = layer_name[:23] + ".." if len(layer_name) > 25 else layer_name
@@ -83,7 +115,6 @@ async def show_all_table_data(conn, table_name):
     
     # 限制显示前10条记录
     cursor = await conn.execute(f"SELECT * FROM {table_name} LIMIT 10")
-    rows = await cursor.fetchall()
     
     # 打印表头
     header = " | ".join(f"{col:15}" for col in column_names)
@@ -91,9 +122,17 @@ async def show_all_table_data(conn, table_name):
     print(f"  {'-' * len(header)}")
     
     # 打印数据行
-    for row in rows:
+    async for row in cursor:
         row_data = " | ".join(f"{str(val)[:15]:15}" for val in row)
         print(f"  {row_data}")
 
 if __name__ == "__main__":
-    asyncio.run(show_database_tables())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="检查数据库中的表信息和数据内容")
+    parser.add_argument(
+        "--limit",
+        type=positive_int,
+        default=DEFAULT_DISPLAY_LIMIT,
+        help=f"layer_resources表最多显示的记录数（默认{DEFAULT_DISPLAY_LIMIT}）"
+    )
+    args = parser.parse_args()
+    asyncio.run(show_database_tables(args.limit))
\ No newline at end of file
@@ -6,28 +6,129 @@
 
 import aiosqlite
 import logging
+import re
+import sqlite3
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Dict, List, Optional
 import asyncio
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# 连接级性能参数（WAL之外的PRAGMA，每个连接建立时执行一次）
+CONNECTION_PRAGMAS = """
+PRAGMA temp_store = MEMORY;
+PRAGMA cache_size = -64000;
+PRAGMA mmap_size = 268435456;
+PRAGMA foreign_keys = ON;
+"""
+
+# 当前表结构版本，记录在PRAGMA user_version中；表结构或索引变更时需递增
+CURRENT_SCHEMA_VERSION = 4
+
+# 每个连接缓存的预编译语句数量（SQL文本相同且使用?占位符时复用）
+STATEMENT_CACHE_SIZE = 256
+
+
+def _fts5_trigram_available() -> bool:
+    """检测当前SQLite是否支持FTS5 trigram分词器（需要SQLite 3.34+）"""
+    try:
+        probe = sqlite3.connect(":memory:")
+        try:
+            probe.execute("CREATE VIRTUAL TABLE probe USING fts5(x, tokenize='trigram')")
+        finally:
+            probe.close()
+        return True
+    except sqlite3.Error:
+        return False
+
+
+# 图层名称/服务名称的子串搜索是否使用FTS5 trigram索引
+FTS5_TRIGRAM_AVAILABLE = _fts5_trigram_available()
+
+# 全文索引表及同步触发器
+# 以resource_id关联主表：主表没有INTEGER PRIMARY KEY，rowid在VACUUM后可能变化
+CREATE_FTS_SQL = [
+    "DROP TABLE IF EXISTS layer_resources_fts;",
+    """CREATE VIRTUAL TABLE layer_resources_fts USING fts5(
+        resource_id UNINDEXED, service_name, layer_name, tokenize='trigram'
+    );""",
+    """INSERT INTO layer_resources_fts (resource_id, service_name, layer_name)
+    SELECT resource_id, service_name, layer_name FROM layer_resources;""",
+    "DROP TRIGGER IF EXISTS layer_resources_fts_insert;",
+    """CREATE TRIGGER layer_resources_fts_insert AFTER INSERT ON layer_resources BEGIN
+        INSERT INTO layer_resources_fts (resource_id, service_name, layer_name)
+        VALUES (new.resource_id, new.service_name, new.layer_name);
+    END;""",
+    "DROP TRIGGER IF EXISTS layer_resources_fts_delete;",
+    """CREATE TRIGGER layer_resources_fts_delete AFTER DELETE ON layer_resources BEGIN
+        DELETE FROM layer_resources_fts WHERE resource_id = old.resource_id;
+    END;""",
+    "DROP TRIGGER IF EXISTS layer_resources_fts_update;",
+    """CREATE TRIGGER layer_resources_fts_update AFTER UPDATE OF resource_id, service_name, layer_name ON layer_resources BEGIN
+        UPDATE layer_resources_fts
+        SET resource_id = new.resource_id, service_name = new.service_name, layer_name = new.layer_name
+        WHERE resource_id = old.resource_id;
+    END;"""
+]
+
+# 全文索引同步触发器名称
+FTS_TRIGGER_NAMES = (
+    "layer_resources_fts_insert",
+    "layer_resources_fts_delete",
+    "layer_resources_fts_update",
+)
+
+
+@lru_cache(maxsize=256)
+def _column_names(description: tuple) -> tuple:
+    """提取列名元组（同一语句的description只解析一次）"""
+    return tuple(column[0] for column in description)
+
+
+def _dict_row_factory(cursor, row: tuple) -> dict:
+    """将查询结果行转换为字典
+    
+    作为连接的row_factory在aiosqlite工作线程中执行，不占用事件循环
+    """
+    return dict(zip(_column_names(cursor.description), row))
+
 
 class DatabaseManager:
     """数据库管理器
     
     负责SQLite数据库的连接管理、初始化和基础操作
+    写操作使用单一的写连接，读操作使用只读连接池，WAL模式下读写互不阻塞
     """
     
-    def __init__(self, db_path: str = "data/ogc_layers.db"):
+    def __init__(self, db_path: str = "data/ogc_layers.db", read_pool_size: int = 5):
         """初始化数据库管理器
         
         Args:
             db_path: 数据库文件路径
+            read_pool_size: 只读连接池的最大连接数
         """
         self.db_path = Path(db_path)
         self._connection: Optional[aiosqlite.Connection] = None
         self._lock = asyncio.Lock()
+        # 写连接上的显式事务跨越多次await，需要串行化写操作
+        self._write_lock = asyncio.Lock()
+        
+        # 只读连接池（按需创建，最多read_pool_size个连接）
+        # 池中的None表示旧连接已关闭、释放了名额，用于唤醒等待连接的查询
+        self._read_pool_size = max(1, read_pool_size)
+        self._read_pool: asyncio.Queue = asyncio.Queue()
+        self._read_opened = 0
+        # 连接池代数：关闭连接池时递增，借出期间连接池被关闭的连接在归还时直接关闭
+        self._read_generation = 0
+        self._read_connection_generations: Dict[aiosqlite.Connection, int] = {}
+        
+        # 当前数据库文件中的全文索引是否可用（连接建立和表结构初始化时根据实际表结构确定）
+        self.fts_enabled = False
+        
+        # 写操作计数，写语句实际修改了数据后递增，供上层缓存判断数据是否已变化
+        self.write_generation = 0
         
         # 确保数据目录存在
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -38,26 +139,172 @@ class DatabaseManager:
         Returns:
             数据库连接对象
         """
+        # 连接建立后不再变化，热路径无需加锁
+        if self._connection is not None:
+            return self._connection
+        
         async with self._lock:
             if self._connection is None:
-                self._connection = await aiosqlite.connect(
-                    self.db_path,
-                    check_same_thread=False
-                )
-                # 启用外键约束
-                await self._connection.execute("PRAGMA foreign_keys = ON")
-                await self._connection.commit()
+                connection = await self._open_connection()
+                # 写连接使用自动提交模式，批量写入时显式控制事务
+                connection.isolation_level = None
+                await self._sync_fts_index(connection)
+                # 配置完成后再发布，避免其他协程拿到未配置的连接
+                self._connection = connection
                 logger.info(f"数据库连接已建立: {self.db_path}")
             
             return self._connection
     
+    async def _open_connection(self) -> aiosqlite.Connection:
+        """创建并配置一个新的数据库连接
+        
+        Returns:
+            数据库连接对象
+        """
+        conn = await aiosqlite.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+        await self._configure_connection(conn)
+        return conn
+    
+    async def _open_read_connection(self) -> aiosqlite.Connection:
+        """新建一个只读连接并计入当前连接池
+        
+        Returns:
+            只读数据库连接
+        """
+        # 先占用名额再建立连接，避免并发请求超出上限
+        self._read_opened += 1
+        try:
+            conn = await self._open_connection()
+            await conn.execute("PRAGMA query_only = ON")
+            conn.row_factory = _dict_row_factory
+        except Exception:
+            self._read_opened -= 1
+            raise
+        self._read_connection_generations[conn] = self._read_generation
+        return conn
+    
+    @asynccontextmanager
+    async def _acquire_read(self) -> AsyncIterator[aiosqlite.Connection]:
+        """从只读连接池借出一个连接
+        
+        池中无空闲连接且未达到上限时新建连接，否则等待其他查询归还
+        
+        Yields:
+            只读数据库连接
+        """
+        # 确保写连接已建立（WAL模式由写连接首先启用）
+        await self.connect()
+        
+        while True:
+            try:
+                conn = self._read_pool.get_nowait()
+            except asyncio.QueueEmpty:
+                if self._read_opened < self._read_pool_size:
+                    conn = await self._open_read_connection()
+                else:
+                    conn = await self._read_pool.get()
+            if conn is not None:
+                break
+            # 收到旧连接释放名额的通知，重新检查是否可以新建连接
+        
+        try:
+            yield conn
+        finally:
+            if self._read_connection_generations.get(conn) == self._read_generation:
+                self._read_pool.put_nowait(conn)
+            else:
+                # 借出期间连接池已关闭，直接关闭该连接并唤醒可能在等待的查询
+                self._read_connection_generations.pop(conn, None)
+                self._read_pool.put_nowait(None)
+                await conn.close()
+    
+    async def _configure_connection(self, conn: aiosqlite.Connection):
+        """配置连接参数
+        
+        启用WAL日志模式并调整同步、缓存和内存映射参数。
+        WAL在网络文件系统等环境下可能不可用，此时保留原日志模式继续运行。
+        
+        Args:
+            conn: 数据库连接
+        """
+        cursor = await conn.execute("PRAGMA journal_mode = WAL")
+        row = await cursor.fetchone()
+        journal_mode = row[0].lower() if row else ""
+        if journal_mode == "wal":
+            # WAL模式下NORMAL同步级别即可保证一致性，避免每次提交都fsync
+            await conn.execute("PRAGMA synchronous = NORMAL")
+        else:
+            logger.warning(f"无法启用WAL模式，当前日志模式: {journal_mode or 'unknown'}")
+        
+        await conn.executescript(CONNECTION_PRAGMAS)
+    
+    async def _sync_fts_index(self, conn: aiosqlite.Connection):
+        """使全文索引与当前SQLite库的能力保持一致
+        
+        全文索引表和触发器保存在数据库文件中，trigram分词器是否可用却取决于运行时的SQLite库，
+        数据库在不同环境间复制后两者可能不一致：
+        支持trigram但缺少索引表或触发器时重建索引；不支持时删除触发器，避免写入失败
+        
+        Args:
+            conn: 写连接
+        """
+        cursor = await conn.execute(
+            "SELECT name FROM sqlite_master WHERE name IN (?, ?, ?, ?, ?)",
+            ("layer_resources", "layer_resources_fts", *FTS_TRIGGER_NAMES)
+        )
+        existing = {row[0] for row in await cursor.fetchall()}
+        
+        if "layer_resources" not in existing:
+            # 主表尚未创建，由表结构初始化完成后再同步
+            self.fts_enabled = False
+            return
+        
+        if FTS5_TRIGRAM_AVAILABLE:
+            if not existing.issuperset(("layer_resources_fts", *FTS_TRIGGER_NAMES)):
+                logger.info("全文索引缺失或不完整，正在重建...")
+                await conn.executescript("\n".join(["BEGIN;", *CREATE_FTS_SQL, "COMMIT;"]))
+            self.fts_enabled = True
+            return
+        
+        self.fts_enabled = False
+        if existing.intersection(FTS_TRIGGER_NAMES):
+            logger.warning("当前SQLite不支持trigram分词器，停用全文索引")
+            await conn.executescript(
+                "\n".join(f"DROP TRIGGER IF EXISTS {name};" for name in FTS_TRIGGER_NAMES)
+            )
+        if "layer_resources_fts" in existing:
+            try:
+                await conn.execute("DROP TABLE layer_resources_fts")
+            except sqlite3.Error as e:
+                # 缺少分词器时可能无法删除虚拟表；触发器已删除，残留的索引表不再被使用，
+                # 之后在支持trigram的环境中打开时会因缺少触发器而重建
+                logger.warning(f"无法删除全文索引表: {e}")
+    
     async def close(self):
-        """关闭数据库连接"""
+        """关闭数据库连接
+        
+        空闲的读连接立即关闭，正在使用的读连接在查询结束归还时关闭；
+        写连接等待当前写操作完成后关闭
+        """
         async with self._lock:
-            if self._connection:
-                await self._connection.close()
-                self._connection = None
-                logger.info("数据库连接已关闭")
+            # 递增代数后，借出中的读连接归还时不会再回到连接池
+            self._read_generation += 1
+            self._read_opened = 0
+            while not self._read_pool.empty():
+                conn = self._read_pool.get_nowait()
+                if conn is not None:
+                    self._read_connection_generations.pop(conn, None)
+                    await conn.close()
+            
+            async with self._write_lock:
+                if self._connection:
+                    await self._connection.close()
+                    self._connection = None
+                    logger.info("数据库连接已关闭")
     
     async def initialize_database(self):
         """初始化数据库
@@ -73,15 +320,22 @@ class DatabaseManager:
         Args:
             conn: 数据库连接
         """
-        # 检查是否需要迁移表结构
-        cursor = await conn.execute("PRAGMA table_info(layer_resources)")
-        columns = await cursor.fetchall()
+        # 表结构版本已是最新时跳过所有结构检查
+        cursor = await conn.execute("PRAGMA user_version")
+        (schema_version,) = await cursor.fetchone()
+        if schema_version == CURRENT_SCHEMA_VERSION:
+            logger.info("数据库表结构已是最新版本")
+            return
         
-        if columns:
-            column_names = [col[1] for col in columns]
-            if 'crs' in column_names or 'bbox' in column_names:
-                logger.info("检测到旧的表结构，正在更新为基础元数据表...")
-                await self._migrate_to_basic_metadata(conn)
+        # 检查是否需要迁移表结构（只查询旧字段，新建的空库直接返回空结果）
+        cursor = await conn.execute(
+            "SELECT name FROM pragma_table_info('layer_resources') WHERE name IN ('crs', 'bbox')"
+        )
+        legacy_columns = [row[0] for row in await cursor.fetchall()]
+        
+        if legacy_columns:
+            logger.info("检测到旧的表结构，正在更新为基础元数据表...")
+            await self._migrate_to_basic_metadata(conn, legacy_columns)
         
         # 创建基础元数据表（只包含基础字段）
         create_table_sql = """
@@ -100,107 +354,158 @@ class DatabaseManager:
         """
         
         # 创建索引
+        # UNIQUE(service_url, layer_name, service_type)自带的复合索引已覆盖三元组查重、
+        # GROUP BY以及以service_url为前缀的查询，单列的idx_service_url是冗余的
+        # (service_type, created_at)同时支持按类型筛选、按类型分组计数和按时间排序分页，
+        # 取代单列的idx_service_type
         create_indexes_sql = [
-            "CREATE INDEX IF NOT EXISTS idx_service_type ON layer_resources(service_type);",
+            "CREATE INDEX IF NOT EXISTS idx_service_type_created_at ON layer_resources(service_type, created_at);",
+            "CREATE INDEX IF NOT EXISTS idx_created_at ON layer_resources(created_at);",
             "CREATE INDEX IF NOT EXISTS idx_service_name ON layer_resources(service_name);",
             "CREATE INDEX IF NOT EXISTS idx_layer_name ON layer_resources(layer_name);",
-            "CREATE INDEX IF NOT EXISTS idx_service_url ON layer_resources(service_url);"
+            "DROP INDEX IF EXISTS idx_service_type;",
+            "DROP INDEX IF EXISTS idx_service_url;"
         ]
         
+        # 建表、索引和版本号合并为一个脚本，在同一事务中执行并只提交一次
+        schema_script = "\n".join([
+            "BEGIN;",
+            create_table_sql,
+            *create_indexes_sql,
+            f"PRAGMA user_version = {CURRENT_SCHEMA_VERSION};",
+            "COMMIT;"
+        ])
+        
         try:
-            await conn.execute(create_table_sql)
-            
-            for index_sql in create_indexes_sql:
-                await conn.execute(index_sql)
-            
-            await conn.commit()
+            await conn.executescript(schema_script)
+            # 主表就绪后按当前SQLite的能力建立全文索引
+            await self._sync_fts_index(conn)
             logger.info("基础元数据表结构初始化完成")
             
         except Exception as e:
             logger.error(f"数据库初始化失败: {e}")
-            await conn.rollback()
+            if conn.in_transaction:
+                await conn.execute("ROLLBACK")
             raise
     
-    async def _migrate_to_basic_metadata(self, conn: aiosqlite.Connection):
+    async def _migrate_to_basic_metadata(self, conn: aiosqlite.Connection, legacy_columns: List[str]):
         """迁移到基础元数据表结构
         
+        SQLite 3.35+ 且表约束已是最新时直接原地删除旧列，
+        否则或原地删除失败时通过备份表重建。整个迁移在一个事务中完成，失败时回滚。
+        
         Args:
             conn: 数据库连接
+            legacy_columns: 需要移除的旧字段
         """
+        cursor = await conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'layer_resources'"
+        )
+        row = await cursor.fetchone()
+        table_sql = re.sub(r"\s+", "", row[0]) if row else ""
+        
+        # DROP COLUMN无法修改CHECK/UNIQUE约束，仅在约束已满足新结构时使用
+        drop_in_place = (
+            sqlite3.sqlite_version_info >= (3, 35, 0)
+            and "'WMTS'" in table_sql
+            and "UNIQUE(service_url,layer_name,service_type)" in table_sql
+        )
+        
+        await conn.execute("BEGIN IMMEDIATE")
         try:
-            # 备份现有数据（只保留基础字段）
-            await conn.execute("""
-                CREATE TEMPORARY TABLE layer_resources_backup AS 
-                SELECT 
-                    resource_id,
-                    service_name,
-                    service_url,
-                    service_type,
-                    layer_name,
-                    layer_title,
-                    layer_abstract,
-                    created_at,
-                    updated_at
-                FROM layer_resources;
-            """)
-            
-            # 删除旧表
-            await conn.execute("DROP TABLE layer_resources;")
-            
-            # 创建新的基础元数据表（添加WMTS类型支持）
-            await conn.execute("""
-                CREATE TABLE layer_resources (
-                    resource_id TEXT PRIMARY KEY,
-                    service_name TEXT NOT NULL,
-                    service_url TEXT NOT NULL,
-                    service_type TEXT NOT NULL CHECK (service_type IN ('WMS', 'WFS', 'WMTS')),
-                    layer_name TEXT NOT NULL,
-                    layer_title TEXT,
-                    layer_abstract TEXT,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL,
-                    UNIQUE(service_url, layer_name, service_type)
-                );
-            """)
-            
-            # 恢复数据
-            await conn.execute("""
-                INSERT INTO layer_resources 
-                SELECT * FROM layer_resources_backup;
-            """)
-            
-            # 删除临时表
-            await conn.execute("DROP TABLE layer_resources_backup;")
+            if drop_in_place:
+                try:
+                    for column in legacy_columns:
+                        await conn.execute(f"ALTER TABLE layer_resources DROP COLUMN {column}")
+                except sqlite3.OperationalError as e:
+                    # 旧列被索引、视图或触发器引用时无法删除，改用备份表重建
+                    logger.warning(f"原地删除旧列失败，改为重建表: {e}")
+                    await self._rebuild_basic_metadata_table(conn)
+            else:
+                await self._rebuild_basic_metadata_table(conn)
             
+            await conn.execute("COMMIT")
             logger.info("表结构迁移完成，已添加WMTS类型支持")
             
         except Exception as e:
+            await conn.execute("ROLLBACK")
             logger.error(f"表结构迁移失败: {e}")
             raise
     
-    async def execute_query(self, sql: str, params: tuple = ()) -> aiosqlite.Cursor:
-        """执行查询语句
+    async def _rebuild_basic_metadata_table(self, conn: aiosqlite.Connection):
+        """通过备份表重建基础元数据表
         
         Args:
-            sql: SQL查询语句
-            params: 查询参数
-            
-        Returns:
-            查询结果游标
+            conn: 数据库连接
         """
-        conn = await self.connect()
-        return await conn.execute(sql, params)
+        # 备份现有数据（只保留基础字段）
+        await conn.execute("""
+            CREATE TEMPORARY TABLE layer_resources_backup AS 
+            SELECT 
+                resource_id,
+                service_name,
+                service_url,
+                service_type,
+                layer_name,
+                layer_title,
+                layer_abstract,
+                created_at,
+                updated_at
+            FROM layer_resources;
+        """)
+        
+        # 删除旧表
+        await conn.execute("DROP TABLE layer_resources;")
+        
+        # 创建新的基础元数据表（添加WMTS类型支持）
+        await conn.execute("""
+            CREATE TABLE layer_resources (
+                resource_id TEXT PRIMARY KEY,
+                service_name TEXT NOT NULL,
+                service_url TEXT NOT NULL,
+                service_type TEXT NOT NULL CHECK (service_type IN ('WMS', 'WFS', 'WMTS')),
+                layer_name TEXT NOT NULL,
+                layer_title TEXT,
+                layer_abstract TEXT,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                UNIQUE(service_url, layer_name, service_type)
+            );
+        """)
+        
+        # 恢复数据
+        await conn.execute("""
+            INSERT INTO layer_resources 
+            SELECT * FROM layer_resources_backup;
+        """)
+        
+        # 删除临时表
+        await conn.execute("DROP TABLE layer_resources_backup;")
     
-    async def execute_many(self, sql: str, params_list: list) -> None:
+    async def execute_many(self, sql: str, params_list: list, chunk_size: int = 10000) -> None:
         """批量执行SQL语句
         
+        所有参数在同一个事务中分块执行，只提交一次
+        
         Args:
             sql: SQL语句
             params_list: 参数列表
+            chunk_size: 每次executemany处理的参数数量
         """
         conn = await self.connect()
-        await conn.executemany(sql, params_list)
-        await conn.commit()
+        async with self._write_lock:
+            changes_before = conn.total_changes
+            await conn.execute("BEGIN IMMEDIATE")
+            try:
+                for start in range(0, len(params_list), chunk_size):
+                    await conn.executemany(sql, params_list[start:start + chunk_size])
+                await conn.execute("COMMIT")
+                # INSERT OR IGNORE全部命中已有记录时没有实际写入
+                if conn.total_changes > changes_before:
+                    self.write_generation += 1
+            except Exception:
+                await conn.execute("ROLLBACK")
+                raise
     
     async def fetch_one(self, sql: str, params: tuple = ()) -> Optional[dict]:
         """查询单条记录
@@ -212,17 +517,11 @@ class DatabaseManager:
         Returns:
             查询结果字典，如果没有结果则返回None
         """
-        cursor = await self.execute_query(sql, params)
-        row = await cursor.fetchone()
-        
-        if row:
-            # 获取列名
-            columns = [description[0] for description in cursor.description]
-            return dict(zip(columns, row))
-        
-        return None
+        async with self._acquire_read() as conn:
+            cursor = await conn.execute(sql, params)
+            return await cursor.fetchone()
     
-    async def fetch_all(self, sql: str, params: tuple = ()) -> list[dict]:
+    async def fetch_all(self, sql: str, params: tuple = ()) -> List[dict]:
         """查询多条记录
         
         Args:
@@ -232,15 +531,29 @@ class DatabaseManager:
         Returns:
             查询结果字典列表
         """
-        cursor = await self.execute_query(sql, params)
-        rows = await cursor.fetchall()
+        async with self._acquire_read() as conn:
+            cursor = await conn.execute(sql, params)
+            return list(await cursor.fetchall())
+    
+    async def iter_all(self, sql: str, params: tuple = (), batch_size: int = 256) -> AsyncIterator[dict]:
+        """逐行流式读取查询结果
         
-        if rows:
-            # 获取列名
-            columns = [description[0] for description in cursor.description]
-            return [dict(zip(columns, row)) for row in rows]
+        按批从游标取出记录，调用方无需等待整个结果集物化即可开始处理，
+        提前结束迭代时读连接随生成器关闭归还连接池
         
-        return []
+        Args:
+            sql: SQL查询语句
+            params: 查询参数
+            batch_size: 每次从游标取出的记录数
+            
+        Yields:
+            查询结果字典
+        """
+        async with self._acquire_read() as conn:
+            async with conn.execute(sql, params) as cursor:
+                cursor.arraysize = batch_size
+                async for row in cursor:
+                    yield row
     
     async def execute_update(self, sql: str, params: tuple = ()) -> int:
         """执行更新语句
@@ -253,9 +566,37 @@ class DatabaseManager:
             受影响的行数
         """
         conn = await self.connect()
-        cursor = await conn.execute(sql, params)
-        await conn.commit()
+        # 写连接为自动提交模式，语句执行完即已提交，无需再调用commit()
+        async with self._write_lock:
+            cursor = await conn.execute(sql, params)
+            # 没有行被修改时不递增，避免无谓地使读缓存失效
+            if cursor.rowcount > 0:
+                self.write_generation += 1
         return cursor.rowcount
+    
+    async def execute_returning(self, sql: str, params: tuple = ()) -> Optional[dict]:
+        """执行带RETURNING子句的写语句
+        
+        写入和读取结果在同一条语句中完成（需要SQLite 3.35+）
+        
+        Args:
+            sql: 带RETURNING子句的SQL语句
+            params: 语句参数
+            
+        Returns:
+            第一条返回记录的字典，如果没有匹配记录则返回None
+        """
+        conn = await self.connect()
+        async with self._write_lock:
+            cursor = await conn.execute(sql, params)
+            # 取完所有结果行，语句执行结束后才会提交
+            rows = await cursor.fetchall()
+            if rows:
+                self.write_generation += 1
+        
+        if rows:
+            return _dict_row_factory(cursor, rows[0])
+        return None
 
 
 # 全局数据库管理器实例
@@ -10,6 +10,25 @@ from typing import Optional, Dict, Any
 from pydantic import BaseModel, Field, field_validator
 
 
+# 支持的服务类型
+ALLOWED_SERVICE_TYPES = frozenset({'WMS', 'WFS', 'WMTS'})
+
+
+def _normalize_service_type(v: str) -> str:
+    """验证并规范化服务类型（各模型共用）"""
+    service_type = v.upper()
+    if service_type not in ALLOWED_SERVICE_TYPES:
+        raise ValueError(f"服务类型必须是 {sorted(ALLOWED_SERVICE_TYPES)} 之一")
+    return service_type
+
+
+def _check_service_url(v: str) -> str:
+    """验证服务URL（各模型共用）"""
+    if not v.startswith(('http://', 'https://')):
+        raise ValueError('服务URL必须以http://或https://开头')
+    return v
+
+
 class LayerResource(BaseModel):
     """图层资源基础元数据模型
     
@@ -30,43 +49,20 @@ class LayerResource(BaseModel):
     @classmethod
     def validate_service_type(cls, v):
         """验证服务类型"""
-        allowed_types = ['WMS', 'WFS', 'WMTS']
-        if v.upper() not in allowed_types:
-            raise ValueError(f'服务类型必须是 {allowed_types} 之一')
-        return v.upper()
+        return _normalize_service_type(v)
 
     @field_validator('service_url')
     @classmethod
     def validate_service_url(cls, v):
         """验证服务URL"""
-        if not v.startswith(('http://', 'https://')):
-            raise ValueError('服务URL必须以http://或https://开头')
-        return v
+        return _check_service_url(v)
 
     def to_dict(self) -> Dict[str, Any]:
-        """转换为字典格式，用于数据库存储"""
-        return {
-            "resource_id": self.resource_id,
-            "service_name": self.service_name,
-            "service_url": self.service_url,
-            "service_type": self.service_type,
-            "layer_name": self.layer_name,
-            "layer_title": self.layer_title,
-            "layer_abstract": self.layer_abstract,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
-        }
-
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "LayerResource":
-        """从字典创建图层资源对象"""
-        # 处理时间字段
-        if isinstance(data.get('created_at'), str):
-            data['created_at'] = datetime.fromisoformat(data['created_at'])
-        if isinstance(data.get('updated_at'), str):
-            data['updated_at'] = datetime.fromisoformat(data['updated_at'])
-            
-        return cls(**data)
+        """转换为字典格式，用于数据库存储
+        
+        由pydantic-core直接序列化，时间字段输出为ISO格式字符串
+        """
+        return self.model_dump(mode="json")
 
 
 class LayerResourceCreate(BaseModel):
@@ -85,18 +81,13 @@ class LayerResourceCreate(BaseModel):
     @classmethod
     def validate_service_type(cls, v):
         """验证服务类型"""
-        allowed_types = ['WMS', 'WFS', 'WMTS']
-        if v.upper() not in allowed_types:
-            raise ValueError(f'服务类型必须是 {allowed_types} 之一')
-        return v.upper()
+        return _normalize_service_type(v)
 
     @field_validator('service_url')
     @classmethod
     def validate_service_url(cls, v):
         """验证服务URL"""
-        if not v.startswith(('http://', 'https://')):
-            raise ValueError('服务URL必须以http://或https://开头')
-        return v
+        return _check_service_url(v)
 
 
 class LayerResourceUpdate(BaseModel):
@@ -115,20 +106,13 @@ class LayerResourceUpdate(BaseModel):
     @classmethod
     def validate_service_type(cls, v):
         """验证服务类型"""
-        if v is not None:
-            allowed_types = ['WMS', 'WFS', 'WMTS']
-            if v.upper() not in allowed_types:
-                raise ValueError(f'服务类型必须是 {allowed_types} 之一')
-            return v.upper()
-        return v
+        return _normalize_service_type(v) if v is not None else v
 
     @field_validator('service_url')
     @classmethod
     def validate_service_url(cls, v):
         """验证服务URL"""
-        if v is not None and not v.startswith(('http://', 'https://')):
-            raise ValueError('服务URL必须以http://或https://开头')
-        return v
+        return _check_service_url(v) if v is not None else v
 
 
 class LayerResourceQuery(BaseModel):
@@ -4,9 +4,12 @@
 提供图层资源的CRUD操作接口
 """
 
+import os
+import sqlite3
+import time
 import uuid
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 import logging
 
 from .models import LayerResource, LayerResourceCreate, LayerResourceUpdate, LayerResourceQuery
@@ -14,6 +17,134 @@ from .connection import DatabaseManager, get_db_manager
 
 logger = logging.getLogger(__name__)
 
+# UPDATE ... RETURNING 需要SQLite 3.35+
+SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+
+def _new_resource_id() -> str:
+    """生成按时间排序的UUIDv7资源ID
+    
+    高48位为毫秒时间戳，新记录总是追加到主键索引末尾，
+    避免随机UUID导致的B树页分裂
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), 'big')
+    value = (timestamp_ms & 0xFFFFFFFFFFFF) << 80
+    value |= 0x7 << 76                          # 版本号 7
+    value |= ((rand >> 62) & 0xFFF) << 64       # rand_a，12位
+    value |= 0b10 << 62                         # RFC 4122 变体
+    value |= rand & 0x3FFFFFFFFFFFFFFF          # rand_b，62位
+    return str(uuid.UUID(int=value))
+
+
+def _build_layer_resource(resource_id: str, layer_data: LayerResourceCreate, now: datetime) -> LayerResource:
+    """由已验证的创建数据构建图层资源对象
+    
+    LayerResourceCreate已执行过服务类型和URL验证，
+    这里使用model_construct跳过重复验证
+    """
+    return LayerResource.model_construct(
+        resource_id=resource_id,
+        service_name=layer_data.service_name,
+        service_url=layer_data.service_url,
+        service_type=layer_data.service_type,
+        layer_name=layer_data.layer_name,
+        layer_title=layer_data.layer_title,
+        layer_abstract=layer_data.layer_abstract,
+        created_at=now,
+        updated_at=now
+    )
+
+
+# 插入图层资源（只包含基础元数据字段），conflict_clause用于指定冲突处理方式
+INSERT_LAYER_SQL = """
+INSERT {conflict_clause}INTO layer_resources (
+    resource_id, service_name, service_url, service_type,
+    layer_name, layer_title, layer_abstract,
+    created_at, updated_at
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+# 更新图层资源的固定语句：非空列未设置时传None由COALESCE保留原值，
+# 可空列通过是否设置的标志区分"未设置"和"显式置空"
+UPDATE_LAYER_SQL = """
+UPDATE layer_resources SET
+    service_name = COALESCE(?, service_name),
+    service_url = COALESCE(?, service_url),
+    service_type = COALESCE(?, service_type),
+    layer_name = COALESCE(?, layer_name),
+    layer_title = CASE WHEN ? THEN ? ELSE layer_title END,
+    layer_abstract = CASE WHEN ? THEN ? ELSE layer_abstract END,
+    updated_at = ?
+WHERE resource_id = ?
+"""
+
+
+def _insert_params(layer_resource: LayerResource) -> tuple:
+    """构建插入语句的参数元组
+    
+    直接读取模型属性，只对两个时间字段做ISO格式化，
+    避免为每一行序列化整个模型
+    """
+    return (
+        layer_resource.resource_id,
+        layer_resource.service_name,
+        layer_resource.service_url,
+        layer_resource.service_type,
+        layer_resource.layer_name,
+        layer_resource.layer_title,
+        layer_resource.layer_abstract,
+        layer_resource.created_at.isoformat(),
+        layer_resource.updated_at.isoformat()
+    )
+
+
+# trigram索引只能匹配至少3个字符的子串，更短的关键词直接在主表上LIKE
+FTS_MIN_TERM_LENGTH = 3
+
+
+def _build_query_conditions(query: LayerResourceQuery, use_fts: bool) -> Tuple[list, list]:
+    """构建列表查询和计数共用的WHERE条件
+    
+    服务名称和图层名称的模糊匹配在可用时通过FTS5 trigram索引完成，
+    避免前导通配符LIKE导致的全表扫描
+    
+    Args:
+        query: 查询参数
+        use_fts: 当前数据库的全文索引是否可用
+        
+    Returns:
+        (WHERE条件列表, 参数列表)
+    """
+    where_conditions = []
+    params = []
+    
+    if query.service_type:
+        where_conditions.append("service_type = ?")
+        params.append(query.service_type)
+    
+    fts_conditions = []
+    fts_params = []
+    for column, term in (("service_name", query.service_name), ("layer_name", query.layer_name)):
+        if not term:
+            continue
+        if use_fts and len(term) >= FTS_MIN_TERM_LENGTH:
+            fts_conditions.append(f"{column} LIKE ?")
+            fts_params.append(f"%{term}%")
+        else:
+            where_conditions.append(f"{column} LIKE ?")
+            params.append(f"%{term}%")
+    
+    if fts_conditions:
+        where_conditions.append(
+            "resource_id IN (SELECT resource_id FROM layer_resources_fts WHERE "
+            + " AND ".join(fts_conditions) + ")"
+        )
+        params.extend(fts_params)
+    
+    return where_conditions, params
+
 
 class LayerResourceRepository:
     """图层资源数据访问层
@@ -42,61 +173,81 @@ class LayerResourceRepository:
             ValueError: 当图层资源已存在时
         """
         # 生成唯一ID
-        resource_id = str(uuid.uuid4())
-        
-        # 检查是否已存在相同的图层（包含服务类型）
-        existing = await self.get_by_service_layer_and_type(
-            layer_data.service_url, 
-            layer_data.layer_name,
-            layer_data.service_type
-        )
-        if existing:
-            raise ValueError(f"图层资源已存在: {layer_data.service_url} - {layer_data.layer_name} ({layer_data.service_type})")
+        resource_id = _new_resource_id()
         
         # 创建图层资源对象（只包含基础元数据）
         now = datetime.now()
-        layer_resource = LayerResource(
-            resource_id=resource_id,
-            service_name=layer_data.service_name,
-            service_url=layer_data.service_url,
-            service_type=layer_data.service_type,
-            layer_name=layer_data.layer_name,
-            layer_title=layer_data.layer_title,
-            layer_abstract=layer_data.layer_abstract,
-            created_at=now,
-            updated_at=now
-        )
+        layer_resource = _build_layer_resource(resource_id, layer_data, now)
         
         # 插入数据库（只包含基础元数据字段）
-        insert_sql = """
-        INSERT INTO layer_resources (
-            resource_id, service_name, service_url, service_type,
-            layer_name, layer_title, layer_abstract,
-            created_at, updated_at
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
-        
-        data_dict = layer_resource.to_dict()
-        params = (
-            data_dict['resource_id'],
-            data_dict['service_name'],
-            data_dict['service_url'],
-            data_dict['service_type'],
-            data_dict['layer_name'],
-            data_dict['layer_title'],
-            data_dict['layer_abstract'],
-            data_dict['created_at'],
-            data_dict['updated_at']
-        )
+        insert_sql = INSERT_LAYER_SQL.format(conflict_clause="")
+        params = _insert_params(layer_resource)
         
         try:
             await self.db_manager.execute_update(insert_sql, params)
             logger.info(f"图层资源创建成功: {resource_id}")
             return layer_resource
+        except sqlite3.IntegrityError:
+            # 由UNIQUE(service_url, layer_name, service_type)约束检测重复，无需预先查询
+            raise ValueError(f"图层资源已存在: {layer_data.service_url} - {layer_data.layer_name} ({layer_data.service_type})")
         except Exception as e:
             logger.error(f"创建图层资源失败: {e}")
             raise
     
+    async def create_many(self, layers_data: List[LayerResourceCreate]) -> List[Tuple[LayerResource, bool]]:
+        """批量创建图层资源
+        
+        所有记录在一个事务中插入，已存在的图层（相同URL、图层名和服务类型）
+        由UNIQUE约束忽略，不再逐条预先查询
+        
+        Args:
+            layers_data: 图层资源创建数据列表
+            
+        Returns:
+            与输入顺序对应的(图层资源对象, 是否新建)列表，
+            被忽略的已存在图层返回数据库中的原有记录
+        """
+        if not layers_data:
+            return []
+        
+        now = datetime.now()
+        layer_resources = [
+            _build_layer_resource(_new_resource_id(), layer_data, now)
+            for layer_data in layers_data
+        ]
+        
+        insert_sql = INSERT_LAYER_SQL.format(conflict_clause="OR IGNORE ")
+        
+        try:
+            await self.db_manager.execute_many(
+                insert_sql,
+                [_insert_params(layer_resource) for layer_resource in layer_resources]
+            )
+        except Exception as e:
+            logger.error(f"批量创建图层资源失败: {e}")
+            raise
+        
+        # 按服务URL读取写入后的记录（由UNIQUE索引前缀完成查找），区分新建和已存在的图层；
+        # 每次查询只绑定一个参数，批量大小不受SQLite绑定参数数量上限限制
+        stored_rows = {}
+        for service_url in {layer_resource.service_url for layer_resource in layer_resources}:
+            sql = "SELECT * FROM layer_resources WHERE service_url = ?"
+            async for row in self.db_manager.iter_all(sql, (service_url,)):
+                stored_rows[(row['service_url'], row['layer_name'], row['service_type'])] = row
+        
+        results = []
+        created_count = 0
+        for layer_resource in layer_resources:
+            row = stored_rows.get((layer_resource.service_url, layer_resource.layer_name, layer_resource.service_type))
+            if row is None or row['resource_id'] == layer_resource.resource_id:
+                created_count += 1
+                results.append((layer_resource, True))
+            else:
+                results.append((LayerResource.model_validate(row), False))
+        
+        logger.info(f"批量创建图层资源: 成功 {created_count} 个，忽略已存在 {len(results) - created_count} 个")
+        return results
+    
     async def get_by_id(self, resource_id: str) -> Optional[LayerResource]:
         """根据ID获取图层资源
         
@@ -110,7 +261,7 @@ class LayerResourceRepository:
         result = await self.db_manager.fetch_one(sql, (resource_id,))
         
         if result:
-            return LayerResource.from_dict(result)
+            return LayerResource.model_validate(result)
         return None
     
     async def get_by_service_and_layer(self, service_url: str, layer_name: str) -> Optional[LayerResource]:
@@ -127,7 +278,7 @@ class LayerResourceRepository:
         result = await self.db_manager.fetch_one(sql, (service_url, layer_name))
         
         if result:
-            return LayerResource.from_dict(result)
+            return LayerResource.model_validate(result)
         return None
     
     async def get_by_service_layer_and_type(self, service_url: str, layer_name: str, service_type: str) -> Optional[LayerResource]:
@@ -145,9 +296,35 @@ class LayerResourceRepository:
         result = await self.db_manager.fetch_one(sql, (service_url, layer_name, service_type))
         
         if result:
-            return LayerResource.from_dict(result)
+            return LayerResource.model_validate(result)
         return None
     
+    async def get_layers_by_name(self, layer_name: str) -> List[LayerResource]:
+        """根据图层名称精确获取所有同名图层资源（可能来自不同服务类型）
+        
+        Args:
+            layer_name: 图层名称
+            
+        Returns:
+            图层资源列表，按创建时间倒序
+        """
+        sql = "SELECT * FROM layer_resources WHERE layer_name = ? ORDER BY created_at DESC"
+        results = await self.db_manager.fetch_all(sql, (layer_name,))
+        return [LayerResource.model_validate(result) for result in results]
+    
+    async def list_layer_names(self, limit: int = 10) -> List[str]:
+        """获取最近注册的图层名称
+        
+        Args:
+            limit: 返回数量限制
+            
+        Returns:
+            图层名称列表
+        """
+        sql = "SELECT layer_name FROM layer_resources ORDER BY created_at DESC LIMIT ?"
+        results = await self.db_manager.fetch_all(sql, (limit,))
+        return [result['layer_name'] for result in results]
+    
     async def get_layers_by_service_url(self, service_url: str) -> List[LayerResource]:
         """根据服务URL获取所有图层资源
         
@@ -157,9 +334,20 @@ class LayerResourceRepository:
         Returns:
             图层资源列表
         """
+        return [layer async for layer in self.iter_layers_by_service_url(service_url)]
+    
+    async def iter_layers_by_service_url(self, service_url: str) -> AsyncIterator[LayerResource]:
+        """根据服务URL流式获取图层资源
+        
+        Args:
+            service_url: 服务URL
+            
+        Yields:
+            图层资源对象
+        """
         sql = "SELECT * FROM layer_resources WHERE service_url = ?"
-        results = await self.db_manager.fetch_all(sql, (service_url,))
-        return [LayerResource.from_dict(result) for result in results]
+        async for row in self.db_manager.iter_all(sql, (service_url,)):
+            yield LayerResource.model_validate(row)
     
     async def delete_by_service_url_and_type(self, service_url: str, service_type: str) -> int:
         """删除指定服务URL和类型的所有图层资源
@@ -190,21 +378,36 @@ class LayerResourceRepository:
         Returns:
             图层资源列表
         """
-        # 构建查询条件
-        where_conditions = []
-        params = []
+        return [layer async for layer in self.iter_resources(query)]
+    
+    async def iter_resources(self, query: LayerResourceQuery) -> AsyncIterator[LayerResource]:
+        """流式查询图层资源
         
-        if query.service_type:
-            where_conditions.append("service_type = ?")
-            params.append(query.service_type)
+        逐条构建图层对象，调用方可以边读边处理或提前结束
+        
+        Args:
+            query: 查询参数
+            
+        Yields:
+            图层资源对象
+        """
+        async for row in self.iter_resource_dicts(query):
+            yield LayerResource.model_validate(row)
+    
+    async def iter_resource_dicts(self, query: LayerResourceQuery) -> AsyncIterator[Dict[str, Any]]:
+        """流式查询图层资源，直接返回数据库行字典
         
-        if query.service_name:
-            where_conditions.append("service_name LIKE ?")
-            params.append(f"%{query.service_name}%")
+        表的列与LayerResource字段一一对应，时间字段入库时即为ISO格式字符串，
+        行字典与LayerResource.to_dict()的结果相同，只读场景可省去模型校验和再序列化
         
-        if query.layer_name:
-            where_conditions.append("layer_name LIKE ?")
-            params.append(f"%{query.layer_name}%")
+        Args:
+            query: 查询参数
+            
+        Yields:
+            图层资源字典
+        """
+        # 构建查询条件
+        where_conditions, params = _build_query_conditions(query, self.db_manager.fts_enabled)
         
         # 构建SQL语句
         sql = "SELECT * FROM layer_resources"
@@ -214,8 +417,42 @@ class LayerResourceRepository:
         sql += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
         params.extend([query.limit, query.offset])
         
+        async for row in self.db_manager.iter_all(sql, tuple(params)):
+            yield row
+    
+    async def list_with_total(self, query: LayerResourceQuery) -> Tuple[List[LayerResource], int]:
+        """查询一页图层资源并同时返回符合条件的总数
+        
+        通过COUNT(*) OVER ()窗口函数在同一次查询中得到总数
+        
+        Args:
+            query: 查询参数
+            
+        Returns:
+            (图层资源列表, 符合条件的资源总数)
+        """
+        where_conditions, params = _build_query_conditions(query, self.db_manager.fts_enabled)
+        
+        sql = "SELECT *, COUNT(*) OVER () AS total_count FROM layer_resources"
+        if where_conditions:
+            sql += " WHERE " + " AND ".join(where_conditions)
+        
+        sql += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
+        params.extend([query.limit, query.offset])
+        
         results = await self.db_manager.fetch_all(sql, tuple(params))
-        return [LayerResource.from_dict(result) for result in results]
+        
+        if not results:
+            # 偏移量超出结果范围时窗口函数没有返回行，需要单独计数
+            total = await self.count(query) if query.offset > 0 else 0
+            return [], total
+        
+        total = results[0]['total_count']
+        layers = []
+        for result in results:
+            del result['total_count']
+            layers.append(LayerResource.model_validate(result))
+        return layers, total
     
     async def update(self, resource_id: str, update_data: LayerResourceUpdate) -> Optional[LayerResource]:
         """更新图层资源
@@ -227,36 +464,34 @@ class LayerResourceRepository:
         Returns:
             更新后的图层资源对象，如果资源不存在则返回None
         """
-        # 检查资源是否存在
-        existing = await self.get_by_id(resource_id)
-        if not existing:
-            return None
-        
-        # 构建更新字段（只包含基础元数据字段）
-        update_fields = []
-        params = []
-        
-        for field, value in update_data.dict(exclude_unset=True).items():
-            # 跳过动态参数字段
-            if field in ['crs', 'bbox']:
-                continue
-            update_fields.append(f"{field} = ?")
-            params.append(value)
-        
-        if not update_fields:
-            return existing
-        
-        # 添加更新时间
-        update_fields.append("updated_at = ?")
-        params.append(datetime.now().isoformat())
-        
-        # 添加WHERE条件
-        params.append(resource_id)
+        fields_set = update_data.model_fields_set
+        if not fields_set:
+            return await self.get_by_id(resource_id)
         
-        sql = f"UPDATE layer_resources SET {', '.join(update_fields)} WHERE resource_id = ?"
+        params = (
+            update_data.service_name,
+            update_data.service_url,
+            update_data.service_type,
+            update_data.layer_name,
+            'layer_title' in fields_set, update_data.layer_title,
+            'layer_abstract' in fields_set, update_data.layer_abstract,
+            datetime.now().isoformat(),
+            resource_id
+        )
+        sql = UPDATE_LAYER_SQL
         
         try:
-            await self.db_manager.execute_update(sql, tuple(params))
+            if SUPPORTS_RETURNING:
+                # 更新和读取合并为一条语句，资源不存在时返回None
+                result = await self.db_manager.execute_returning(f"{sql} RETURNING *", params)
+                if not result:
+                    return None
+                logger.info(f"图层资源更新成功: {resource_id}")
+                return LayerResource.model_validate(result)
+            
+            affected_rows = await self.db_manager.execute_update(sql, params)
+            if affected_rows == 0:
+                return None
             logger.info(f"图层资源更新成功: {resource_id}")
             return await self.get_by_id(resource_id)
         except Exception as e:
@@ -296,20 +531,7 @@ class LayerResourceRepository:
             符合条件的资源数量
         """
         # 构建查询条件
-        where_conditions = []
-        params = []
-        
-        if query.service_type:
-            where_conditions.append("service_type = ?")
-            params.append(query.service_type)
-        
-        if query.service_name:
-            where_conditions.append("service_name LIKE ?")
-            params.append(f"%{query.service_name}%")
-        
-        if query.layer_name:
-            where_conditions.append("layer_name LIKE ?")
-            params.append(f"%{query.layer_name}%")
+        where_conditions, params = _build_query_conditions(query, self.db_manager.fts_enabled)
         
         # 构建SQL语句
         sql = "SELECT COUNT(*) as count FROM layer_resources"
@@ -319,14 +541,67 @@ class LayerResourceRepository:
         result = await self.db_manager.fetch_one(sql, tuple(params))
         return result['count'] if result else 0
 
+    async def count_by_service_type(self) -> Dict[str, int]:
+        """按服务类型统计图层资源数量
+        
+        一次分组查询同时得到各类型数量和总数
+        
+        Returns:
+            服务类型到数量的映射，另含键"total"表示总数
+        """
+        sql = """
+        SELECT service_type, COUNT(*) AS count, SUM(COUNT(*)) OVER () AS total
+        FROM layer_resources
+        GROUP BY service_type
+        """
+        results = await self.db_manager.fetch_all(sql)
+        
+        counts = {result['service_type']: result['count'] for result in results}
+        counts['total'] = results[0]['total'] if results else 0
+        return counts
+    
+    async def count_by_service(self) -> List[Dict[str, Any]]:
+        """按服务名称和服务类型统计图层数量
+        
+        计数在SQL中完成，service_url取该服务最近创建的图层记录
+        
+        Returns:
+            服务统计列表，按最近创建时间倒序
+        """
+        sql = """
+        SELECT service_name, service_type, service_url,
+               MAX(created_at) AS latest_created_at, COUNT(*) AS layer_count
+        FROM layer_resources
+        GROUP BY service_name, service_type
+        ORDER BY latest_created_at DESC
+        """
+        results = await self.db_manager.fetch_all(sql)
+        return [
+            {
+                "service_name": result['service_name'],
+                "service_type": result['service_type'],
+                "service_url": result['service_url'],
+                "layer_count": result['layer_count']
+            }
+            for result in results
+        ]
+
+
+# 全局仓储实例，与全局数据库管理器共享连接
+_layer_repository: Optional[LayerResourceRepository] = None
+
 
 async def get_layer_repository() -> LayerResourceRepository:
     """获取图层资源仓储实例
     
-    用于依赖注入
+    用于依赖注入，仓储只持有数据库管理器，所有调用方共享同一个实例；
+    写操作计数由数据库管理器维护，其他方式创建的仓储实例同样会使上层缓存失效
     
     Returns:
         图层资源仓储实例
     """
-    db_manager = await get_db_manager()
-    return LayerResourceRepository(db_manager)
\ No newline at end of file
+    global _layer_repository
+    if _layer_repository is None:
+        db_manager = await get_db_manager()
+        _layer_repository = LayerResourceRepository(db_manager)
+    return _layer_repository
\ No newline at end of file
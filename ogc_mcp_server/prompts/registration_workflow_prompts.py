@@ -12,26 +12,12 @@ from typing_extensions import Annotated
 
 logger = logging.getLogger(__name__)
 
-# 创建注册工作流提示词服务器
-registration_workflow_server = FastMCP(name="OGC服务注册工作流")
+# 提示词中与用户输入无关的固定部分，模块加载时构建一次
+_REGISTRATION_PREFIX = """OGC服务快速注册
 
+服务URL："""
 
-@registration_workflow_server.prompt(
-    name="ogc_service_registration",
-    description="OGC服务快速注册",
-    tags={"registration", "ogc", "simple"}
-)
-def ogc_service_registration(
-    service_urls: Annotated[str, Field(description="OGC服务URL列表，多个URL用逗号分隔")]
-) -> PromptMessage:
-    """OGC服务快速注册工作流
-    
-    用户提供URL，快速注册并列出结果
-    """
-    
-    instruction_text = f"""OGC服务快速注册
-
-服务URL：{service_urls}
+_REGISTRATION_SUFFIX = """
 
 执行步骤：
 
@@ -55,6 +41,25 @@ def ogc_service_registration(
 
 开始注册服务。"""
 
+# 创建注册工作流提示词服务器
+registration_workflow_server = FastMCP(name="OGC服务注册工作流")
+
+
+@registration_workflow_server.prompt(
+    name="ogc_service_registration",
+    description="OGC服务快速注册",
+    tags={"registration", "ogc", "simple"}
+)
+def ogc_service_registration(
+    service_urls: Annotated[str, Field(description="OGC服务URL列表，多个URL用逗号分隔")]
+) -> PromptMessage:
+    """OGC服务快速注册工作流
+    
+    用户提供URL，快速注册并列出结果
+    """
+    
+    instruction_text = _REGISTRATION_PREFIX + service_urls + _REGISTRATION_SUFFIX
+
     return PromptMessage(
         role="user",
         content=TextContent(type="text", text=instruction_text)
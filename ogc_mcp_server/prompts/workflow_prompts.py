@@ -11,6 +11,38 @@ from typing_extensions import Annotated
 
 logger = logging.getLogger(__name__)
 
+# 提示词中与用户输入无关的固定部分，模块加载时构建一次
+_GEO_WORKFLOW_SUFFIX = """
+
+🎯 工具执行流程(一定要执行工具，不能描述工具返回的信息，每个工具只调用一次)：
+1. search_and_list_geographic_data() - 搜索相关数据，每次任务必须执行
+2. add_wms_layer() - 添加底图
+3. add_wfs_layer() - 添加WFS图层(如果用户查询需要过滤条件，一定要过滤)
+4. create_composite_visualization() - 创建可视化，在图层添加完才能执行
+
+⚡ 立即执行！"""
+
+_WFS_FILTER_DETECTOR_SUFFIX = """
+
+🔍 过滤需求判断：
+分析用户查询，判断是否包含具体的过滤条件：
+
+**需要过滤的情况：**
+- 包含具体地名、区域名称
+- 包含分类、类型限定词
+- 包含数值范围、大小条件
+- 包含时间范围限定
+
+**不需要过滤的情况：**
+- 概览性需求（"所有"、"全部"、"整体"）
+
+🎯 输出格式：
+需要过滤：是/否
+过滤类型：[地名/分类/数值/时间/无]
+关键词：[提取的过滤关键词]
+
+⚡ 快速判断！"""
+
 # 创建工作流提示词子服务器
 workflow_prompts_server = FastMCP(name="地理数据可视化工作流")
 
@@ -28,15 +60,7 @@ def geo_workflow(
     标准化的地理数据可视化执行流程
     """
     
-    instruction_text = f"""{user_request}
-
-🎯 工具执行流程(一定要执行工具，不能描述工具返回的信息，每个工具只调用一次)：
-1. search_and_list_geographic_data() - 搜索相关数据，每次任务必须执行
-2. add_wms_layer() - 添加底图
-3. add_wfs_layer() - 添加WFS图层(如果用户查询需要过滤条件，一定要过滤)
-4. create_composite_visualization() - 创建可视化，在图层添加完才能执行
-
-⚡ 立即执行！"""
+    instruction_text = user_request + _GEO_WORKFLOW_SUFFIX
 
     return PromptMessage(
         role="user", 
@@ -57,26 +81,7 @@ def wfs_filter_detector(
     智能识别用户查询中是否需要过滤条件
     """
     
-    instruction_text = f"""用户查询：{user_query}
-
-🔍 过滤需求判断：
-分析用户查询，判断是否包含具体的过滤条件：
-
-**需要过滤的情况：**
-- 包含具体地名、区域名称
-- 包含分类、类型限定词
-- 包含数值范围、大小条件
-- 包含时间范围限定
-
-**不需要过滤的情况：**
-- 概览性需求（"所有"、"全部"、"整体"）
-
-🎯 输出格式：
-需要过滤：是/否
-过滤类型：[地名/分类/数值/时间/无]
-关键词：[提取的过滤关键词]
-
-⚡ 快速判断！"""
+    instruction_text = "用户查询：" + user_query + _WFS_FILTER_DETECTOR_SUFFIX
 
     return PromptMessage(
         role="user", 
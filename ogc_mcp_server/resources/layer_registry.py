@@ -2,18 +2,23 @@
 图层注册表资源
 
 提供简单的数据端点，用于访问图层注册表信息
-只包含两个核心资源：图层列表和单个图层详情
+核心资源为图层列表和单个图层详情，另提供以下辅助资源：
+- 图层列表的条件读取、分页和按名称搜索
+- 单个图层详情的指定字段读取
 """
 
-import json
+import asyncio
+import hashlib
 import logging
+import time
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional, Tuple
 
+import orjson
 from fastmcp import FastMCP,Context
 
-from ..database.connection import DatabaseManager
-from ..database.repository import LayerResourceRepository
+from ..database.repository import get_layer_repository
 from ..database.models import LayerResourceQuery
 from ..services.ogc_parser import get_ogc_parser
 
@@ -24,22 +29,167 @@ logger = logging.getLogger(__name__)
 layer_registry_server = FastMCP("图层注册服务")
 
 
+# 图层详情中服务类型的展示顺序
+SERVICE_TYPE_ORDER = ('WMS', 'WFS', 'WMTS')
+
+# 支持的服务类型组合 -> (有序服务类型元组, 逗号连接的展示字符串)，只有8种组合，导入时预先计算
+_SUPPORTED_TYPES_TABLE: Dict[frozenset, tuple] = {}
+for _mask in range(1 << len(SERVICE_TYPE_ORDER)):
+    _types = tuple(t for i, t in enumerate(SERVICE_TYPE_ORDER) if _mask & (1 << i))
+    _SUPPORTED_TYPES_TABLE[frozenset(_types)] = (_types, ', '.join(_types))
+del _mask, _types
+
+# 图层详情可按需选择的顶层字段，以及其中依赖远程服务详细信息的字段
+LAYER_DETAIL_FIELDS = frozenset({"basic_info", "access_parameters", "capabilities", "detailed_capabilities", "metadata"})
+REMOTE_DETAIL_FIELDS = frozenset({"access_parameters", "capabilities", "detailed_capabilities", "metadata"})
+
+# 综合能力信息中从第一个可用详细信息复制的字段
+COMBINED_CAPABILITY_KEYS = ("bbox", "crs_list", "default_crs", "attributes", "geometry_type")
+
+# WMTS默认瓦片矩阵集的优先顺序
+PREFERRED_TILE_MATRIX_SETS = ("GoogleMapsCompatible", "EPSG:4326", "EPSG:3857")
+
+# 获取详细信息失败时使用的基础访问参数模板：服务类型 -> (参数键, 图层名字段, 固定参数)
+# 模板为只读映射，嵌套值使用元组，展开到响应中共享时不会被意外修改
+_FALLBACK_ACCESS_PARAMETERS: Dict[str, tuple] = {
+    "WMS": ("wms", "layers", MappingProxyType({
+        "service": "WMS",
+        "version": "1.3.0",
+        "request": "GetMap",
+        "layers": None,
+        "bbox": (-180, -90, 180, 90),
+        "crs": "EPSG:4326",
+        "width": 256,
+        "height": 256,
+        "format": "image/png",
+        "styles": ()
+    })),
+    "WFS": ("wfs", "typeNames", MappingProxyType({
+        "service": "WFS",
+        "version": "2.0.0",
+        "request": "GetFeature",
+        "typeNames": None,
+        "srsName": "EPSG:4326",
+        "bbox": (-180, -90, 180, 90),
+        "maxFeatures": 1000,
+        "outputFormat": "application/json"
+    })),
+    "WMTS": ("wmts", "layer", MappingProxyType({
+        "service": "WMTS",
+        "version": "1.0.0",
+        "request": "GetTile",
+        "layer": None,
+        "style": "",
+        "format": "image/png",
+        "tilematrixset": "GoogleMapsCompatible",
+        "tilematrix": "0",
+        "tilerow": 0,
+        "tilecol": 0
+    })),
+}
+
+# 图层列表缓存有效期（秒），数据库写入后立即失效
+LAYERS_CACHE_TTL = 30.0
+
+# 图层列表缓存：过期时间、对应的数据库写入计数、图层列表及其缓存提示
+_layers_cache: Dict[str, Any] = {"expires": 0.0, "generation": -1, "layers": None, "meta": None}
+
+# 正在进行的图层详情请求：(图层名称, 字段集合) -> 任务，用于合并并发的相同请求
+_layer_detail_inflight: Dict[tuple, asyncio.Task] = {}
+
+# 图层详情并发访问远程OGC服务的最大请求数
+MAX_CONCURRENT_OGC_FETCHES = 16
+_ogc_fetch_semaphore: Optional[asyncio.Semaphore] = None
+
+
+# 按秒缓存的当前时间字符串：(秒级时间戳, ISO格式字符串)
+_now_iso_cache: Tuple[int, str] = (0, "")
+
+
+def _now_iso() -> str:
+    """获取当前时间的ISO格式字符串（秒级精度）
+    
+    同一秒内的多次调用复用同一个字符串，避免每次请求都构建datetime对象
+    """
+    global _now_iso_cache
+    second = int(time.time())
+    if second != _now_iso_cache[0]:
+        _now_iso_cache = (second, datetime.fromtimestamp(second).isoformat())
+    return _now_iso_cache[1]
+
+
 async def _get_all_layers() -> List[Dict[str, Any]]:
     """获取所有图层的基础信息
     
     Returns:
         图层列表
     """
+    repository = await get_layer_repository()
+    # 使用10000的limit值获取所有图层
+    query = LayerResourceQuery(limit=10000)
+    return [layer async for layer in repository.iter_resource_dicts(query)]
+
+
+async def _get_cached_layers() -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """获取带缓存的图层列表及其缓存提示
+    
+    在有效期内且数据库没有新的写入时直接返回上次的结果，
+    避免重复查询数据库、转换字典和计算etag
+    
+    Returns:
+        (图层列表, _meta字段内容)
+    """
+    repository = await get_layer_repository()
+    now = time.monotonic()
+    if (_layers_cache["layers"] is not None
+            and now < _layers_cache["expires"]
+            and _layers_cache["generation"] == repository.db_manager.write_generation):
+        return _layers_cache["layers"], _layers_cache["meta"]
+    
+    # 查询前记录写入计数，查询期间发生的写入会使下次访问重新加载
+    generation = repository.db_manager.write_generation
     try:
-        db_manager = DatabaseManager()
-        repository = LayerResourceRepository(db_manager)
-        # 使用10000的limit值获取所有图层
-        query = LayerResourceQuery(limit=10000)
-        layers = await repository.list_resources(query)
-        return [layer.to_dict() for layer in layers]
+        layers = await _get_all_layers()
     except Exception as e:
+        # 查询失败的空结果不写入缓存
         logger.error(f"获取图层列表失败: {e}")
-        return []
+        return [], _cache_meta(None, cacheable=False)
+    
+    meta = _cache_meta(layers)
+    _layers_cache.update(
+        expires=now + LAYERS_CACHE_TTL,
+        generation=generation,
+        layers=layers,
+        meta=meta
+    )
+    return layers, meta
+
+
+def _dump_json(content: Dict[str, Any]) -> str:
+    """将资源响应序列化为缩进格式的JSON字符串"""
+    return orjson.dumps(content, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+def _cache_meta(content: Any, cacheable: bool = True) -> Dict[str, Any]:
+    """构建资源响应的缓存提示
+    
+    成功响应标记为可缓存并附带内容摘要作为etag，客户端可据此复用缓存；
+    错误响应标记为no-cache，避免错误结果被缓存
+    
+    Args:
+        content: 用于计算etag的稳定内容（不含时间戳等易变字段）
+        cacheable: 是否允许缓存
+        
+    Returns:
+        _meta字段内容
+    """
+    if not cacheable:
+        return {"cache_hint": "no-cache"}
+    payload = orjson.dumps(content, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+    return {
+        "cache_hint": "cache",
+        "etag": hashlib.sha1(payload).hexdigest()
+    }
 
 
 @layer_registry_server.resource(
@@ -57,114 +207,277 @@ async def layers_list(ctx: Context = None) -> Dict[str, Any]:
     Returns:
         图层列表数据
     """
-    layers = await _get_all_layers()
+    layers, meta = await _get_cached_layers()
     
     return {
         "total": len(layers),
         "layers": layers,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": _now_iso(),
+        "_meta": meta
     }
 
 
-
-async def _build_access_parameters_from_details(layer_details: Dict[str, Any], layer_name: str) -> Dict[str, Any]:
-    """根据详细信息构建访问参数
+@layer_registry_server.resource(
+    uri="ogc://layers/if-none-match/{etag}",
+    name="图层列表（条件读取）",
+    description="携带上次读取图层列表时_meta中的etag，图层列表未变化时只返回not_modified标记，否则返回完整列表",
+    mime_type="application/json",
+    tags={"ogc", "layers", "registry", "list"}
+)
+async def layers_list_if_none_match(ctx: Context, etag: str) -> Dict[str, Any]:
+    """图层列表条件读取资源
+    
+    供轮询图层注册表的客户端使用，图层列表未变化时不重复传输全部图层
     
     Args:
-        layer_details: 从layer_details.py获取的详细信息
-        layer_name: 图层名称
+        ctx: 请求上下文
+        etag: 客户端已缓存的图层列表etag
         
     Returns:
-        访问参数字典
+        not_modified标记，或与图层列表资源相同的完整数据
     """
-    access_parameters = {}
-    service_type = layer_details.get("service_type", "").upper()
+    layers, meta = await _get_cached_layers()
     
-    if service_type == "WMS":
-        # 构建WMS访问参数
-        styles = layer_details.get("styles", [])
-        default_style = styles[0]["name"] if styles else ""
-        
-        bbox = layer_details.get("bbox", {}).get("wgs84", [-180, -90, 180, 90])
-        default_crs = layer_details.get("default_crs", "EPSG:4326")
-        
-        access_parameters["wms"] = {
-            "service": "WMS",
-            "version": "1.3.0",
-            "request": "GetMap",
-            "layers": layer_name,
-            "bbox": bbox,
-            "crs": default_crs,
-            "width": 256,
-            "height": 256,
-            "format": "image/png",
-            "styles": [style["name"] for style in styles],
-            "default_style": default_style
+    if meta.get("etag") == etag:
+        return {
+            "not_modified": True,
+            "total": len(layers),
+            "timestamp": _now_iso(),
+            "_meta": meta
         }
+    
+    return {
+        "not_modified": False,
+        "total": len(layers),
+        "layers": layers,
+        "timestamp": _now_iso(),
+        "_meta": meta
+    }
+
+
+@layer_registry_server.resource(
+    uri="ogc://layers/page/{offset}/{limit}",
+    name="图层列表分页",
+    description="分页获取已注册的图层列表，offset为起始位置，limit为每页数量（1-10000）",
+    mime_type="application/json",
+    tags={"ogc", "layers", "registry", "list"}
+)
+async def layers_page(ctx: Context, offset: str, limit: str) -> Dict[str, Any]:
+    """图层列表分页资源
+    
+    只读取并序列化请求的一页图层，大型注册表无需一次加载全部图层
+    
+    Args:
+        ctx: 请求上下文
+        offset: 起始位置
+        limit: 每页数量
         
-    elif service_type == "WFS":
-        # 构建WFS访问参数
-        bbox = layer_details.get("bbox", {}).get("wgs84", [-180, -90, 180, 90])
-        default_crs = layer_details.get("default_crs", "EPSG:4326")
-        
-        access_parameters["wfs"] = {
-            "service": "WFS",
-            "version": "2.0.0",
-            "request": "GetFeature",
-            "typeNames": layer_name,
-            "srsName": default_crs,
-            "bbox": bbox,
-            "maxFeatures": 1000,
-            "outputFormat": "application/json"
+    Returns:
+        当前页的图层列表数据
+    """
+    try:
+        query = LayerResourceQuery(offset=int(offset), limit=int(limit))
+    except ValueError as e:
+        return {
+            "error": f"分页参数无效: {str(e)}",
+            "offset": offset,
+            "limit": limit,
+            "_meta": _cache_meta(None, cacheable=False)
         }
+    
+    try:
+        repository = await get_layer_repository()
+        layers, total = await repository.list_with_total(query)
+    except Exception as e:
+        logger.error(f"分页获取图层列表失败: {e}")
+        return {
+            "error": f"分页获取图层列表失败: {str(e)}",
+            "offset": query.offset,
+            "limit": query.limit,
+            "_meta": _cache_meta(None, cacheable=False)
+        }
+    
+    layer_dicts = [layer.to_dict() for layer in layers]
+    next_offset = query.offset + len(layer_dicts)
+    return {
+        "total": total,
+        "offset": query.offset,
+        "limit": query.limit,
+        "layers": layer_dicts,
+        "next_offset": next_offset if next_offset < total else None,
+        "timestamp": _now_iso(),
+        "_meta": _cache_meta({"total": total, "offset": query.offset, "layers": layer_dicts})
+    }
+
+
+@layer_registry_server.resource(
+    uri="ogc://layers/search/{keyword}",
+    name="图层搜索",
+    description="按图层名称关键词筛选已注册的图层，只返回匹配的图层",
+    mime_type="application/json",
+    tags={"ogc", "layers", "registry", "search"}
+)
+async def layers_search(ctx: Context, keyword: str) -> Dict[str, Any]:
+    """图层搜索资源
+    
+    筛选条件在数据库中执行，只读取匹配的图层，
+    适用于已知图层名称片段而无需加载完整列表的场景
+    
+    Args:
+        ctx: 请求上下文
+        keyword: 图层名称关键词
         
-    elif service_type == "WMTS":
-        # 构建WMTS访问参数
-        tile_matrix_sets = layer_details.get("tile_matrix_sets", [])
-        formats = layer_details.get("formats", ["image/png"])
-        styles = layer_details.get("styles", [])
-        default_style = layer_details.get("default_style", "")
-        default_format = layer_details.get("default_format", "image/png")
-        
-        # 选择默认的瓦片矩阵集
-        default_tile_matrix_set = ""
-        if tile_matrix_sets:
-            # 优先选择常见的瓦片矩阵集
-            for tms in ["GoogleMapsCompatible", "EPSG:4326", "EPSG:3857"]:
-                if tms in tile_matrix_sets:
-                    default_tile_matrix_set = tms
-                    break
-            if not default_tile_matrix_set:
-                default_tile_matrix_set = tile_matrix_sets[0]
-        
-        # 处理样式列表，兼容字符串和字典两种格式
-        style_identifiers = []
-        for style in styles:
-            if isinstance(style, dict):
-                style_identifiers.append(style.get("identifier", ""))
-            else:
-                style_identifiers.append(str(style))
-        
-        access_parameters["wmts"] = {
-            "service": "WMTS",
-            "version": "1.0.0",
-            "request": "GetTile",
-            "layer": layer_name,
-            "style": default_style,
-            "format": default_format,
-            "tilematrixset": default_tile_matrix_set,
-            "tilematrix": "0",  # 默认缩放级别
-            "tilerow": 0,
-            "tilecol": 0,
-            "tile_matrix_sets": tile_matrix_sets,
-            "formats": formats,
-            "styles": style_identifiers,
-            "default_style": default_style,
-            "dimensions": layer_details.get("dimensions", {}),
-            "resource_urls": layer_details.get("resource_urls", {})
+    Returns:
+        匹配的图层列表数据
+    """
+    try:
+        repository = await get_layer_repository()
+        query = LayerResourceQuery(layer_name=keyword, limit=10000)
+        layers = [layer async for layer in repository.iter_resource_dicts(query)]
+    except Exception as e:
+        logger.error(f"搜索图层失败: {e}")
+        return {
+            "error": f"搜索图层失败: {str(e)}",
+            "keyword": keyword,
+            "_meta": _cache_meta(None, cacheable=False)
         }
     
-    return access_parameters
+    return {
+        "keyword": keyword,
+        "total": len(layers),
+        "layers": layers,
+        "timestamp": _now_iso(),
+        "_meta": _cache_meta(layers)
+    }
+
+
+def _get_ogc_fetch_semaphore() -> asyncio.Semaphore:
+    """获取限制远程OGC服务并发访问的信号量（在事件循环中首次使用时创建）"""
+    global _ogc_fetch_semaphore
+    if _ogc_fetch_semaphore is None:
+        _ogc_fetch_semaphore = asyncio.Semaphore(MAX_CONCURRENT_OGC_FETCHES)
+    return _ogc_fetch_semaphore
+
+
+async def _fetch_service_details(ogc_parser, service_url: str, service_type: str, layer_name: str) -> Dict[str, Any]:
+    """在并发上限内获取单个服务类型的图层详细信息"""
+    async with _get_ogc_fetch_semaphore():
+        return await ogc_parser.layer_details_parser.get_layer_details(
+            service_url, service_type, layer_name, strict_mode=True
+        )
+
+
+def _details_bbox_and_crs(layer_details: Dict[str, Any]) -> tuple:
+    """提取WMS/WFS访问参数共用的WGS84边界框和默认坐标系"""
+    bbox = layer_details.get("bbox", {}).get("wgs84", [-180, -90, 180, 90])
+    default_crs = layer_details.get("default_crs", "EPSG:4326")
+    return bbox, default_crs
+
+
+def _build_wms_access_parameters(layer_details: Dict[str, Any], layer_name: str) -> Dict[str, Any]:
+    """构建WMS访问参数"""
+    styles = layer_details.get("styles", [])
+    default_style = styles[0]["name"] if styles else ""
+    bbox, default_crs = _details_bbox_and_crs(layer_details)
+    
+    return {
+        "service": "WMS",
+        "version": "1.3.0",
+        "request": "GetMap",
+        "layers": layer_name,
+        "bbox": bbox,
+        "crs": default_crs,
+        "width": 256,
+        "height": 256,
+        "format": "image/png",
+        "styles": [style["name"] for style in styles],
+        "default_style": default_style
+    }
+
+
+def _build_wfs_access_parameters(layer_details: Dict[str, Any], layer_name: str) -> Dict[str, Any]:
+    """构建WFS访问参数"""
+    bbox, default_crs = _details_bbox_and_crs(layer_details)
+    
+    return {
+        "service": "WFS",
+        "version": "2.0.0",
+        "request": "GetFeature",
+        "typeNames": layer_name,
+        "srsName": default_crs,
+        "bbox": bbox,
+        "maxFeatures": 1000,
+        "outputFormat": "application/json"
+    }
+
+
+def _build_wmts_access_parameters(layer_details: Dict[str, Any], layer_name: str) -> Dict[str, Any]:
+    """构建WMTS访问参数"""
+    tile_matrix_sets = layer_details.get("tile_matrix_sets", [])
+    formats = layer_details.get("formats", ["image/png"])
+    styles = layer_details.get("styles", [])
+    default_style = layer_details.get("default_style", "")
+    default_format = layer_details.get("default_format", "image/png")
+    
+    # 选择默认的瓦片矩阵集：优先选择常见的瓦片矩阵集，否则使用第一个
+    default_tile_matrix_set = ""
+    if tile_matrix_sets:
+        available_sets = set(tile_matrix_sets)
+        default_tile_matrix_set = next(
+            (tms for tms in PREFERRED_TILE_MATRIX_SETS if tms in available_sets),
+            tile_matrix_sets[0]
+        )
+    
+    # 处理样式列表，兼容字符串和字典两种格式
+    style_identifiers = [
+        style.get("identifier", "") if isinstance(style, dict) else str(style)
+        for style in styles
+    ]
+    
+    return {
+        "service": "WMTS",
+        "version": "1.0.0",
+        "request": "GetTile",
+        "layer": layer_name,
+        "style": default_style,
+        "format": default_format,
+        "tilematrixset": default_tile_matrix_set,
+        "tilematrix": "0",  # 默认缩放级别
+        "tilerow": 0,
+        "tilecol": 0,
+        "tile_matrix_sets": tile_matrix_sets,
+        "formats": formats,
+        "styles": style_identifiers,
+        "default_style": default_style,
+        "dimensions": layer_details.get("dimensions", {}),
+        "resource_urls": layer_details.get("resource_urls", {})
+    }
+
+
+# 服务类型 -> (访问参数键, 访问参数构建函数)
+_ACCESS_PARAMETER_BUILDERS = {
+    "WMS": ("wms", _build_wms_access_parameters),
+    "WFS": ("wfs", _build_wfs_access_parameters),
+    "WMTS": ("wmts", _build_wmts_access_parameters),
+}
+
+
+async def _build_access_parameters_from_details(layer_details: Dict[str, Any], layer_name: str) -> Dict[str, Any]:
+    """根据详细信息构建访问参数
+    
+    Args:
+        layer_details: 从layer_details.py获取的详细信息
+        layer_name: 图层名称
+        
+    Returns:
+        访问参数字典
+    """
+    builder = _ACCESS_PARAMETER_BUILDERS.get(layer_details.get("service_type", "").upper())
+    if builder is None:
+        return {}
+    
+    key, build = builder
+    return {key: build(layer_details, layer_name)}
 
 
 @layer_registry_server.resource(
@@ -186,133 +499,155 @@ async def layer_detail(ctx: Context, layer_name: str) -> str:
     Returns:
         图层详细信息的JSON字符串
     """
+    return await _build_layer_detail(layer_name)
+
+
+@layer_registry_server.resource(
+    uri="ogc://layer/{layer_name}/fields/{fields}",
+    name="图层详情（指定字段）",
+    description="获取指定图层详细信息中的部分字段，多个字段用逗号分隔，"
+                "可选：basic_info、access_parameters、capabilities、detailed_capabilities、metadata",
+    mime_type="application/json",
+    tags={"ogc", "layer", "details", "metadata"}
+)
+async def layer_detail_fields(ctx: Context, layer_name: str, fields: str) -> str:
+    """获取指定图层详细信息中的部分字段
+    
+    只请求basic_info时不会访问远程OGC服务
+    
+    Args:
+        ctx: 请求上下文
+        layer_name: 图层名称
+        fields: 逗号分隔的字段列表
+        
+    Returns:
+        只包含所选字段的图层详细信息JSON字符串
+    """
+    selected = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = selected - LAYER_DETAIL_FIELDS
+    if unknown or not selected:
+        return _dump_json({
+            "error": f"不支持的字段: {', '.join(sorted(unknown)) or fields}",
+            "layer_name": layer_name,
+            "available_fields": sorted(LAYER_DETAIL_FIELDS),
+            "_meta": _cache_meta(None, cacheable=False)
+        })
+    
+    return await _build_layer_detail(layer_name, selected)
+
+
+async def _build_layer_detail(layer_name: str, fields: Optional[set] = None) -> str:
+    """构建图层详细信息响应，合并相同参数的并发请求
+    
+    同一图层、同一字段集合的并发请求共享一次数据库查询和远程服务访问
+    
+    Args:
+        layer_name: 图层名称
+        fields: 需要返回的顶层字段集合，None表示全部字段
+        
+    Returns:
+        图层详细信息的JSON字符串
+    """
+    key = (layer_name, frozenset(fields) if fields is not None else None)
+    task = _layer_detail_inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_compute_layer_detail(layer_name, fields))
+        _layer_detail_inflight[key] = task
+        task.add_done_callback(lambda done: _layer_detail_inflight.pop(key, None))
+    
+    # shield避免单个调用方被取消时中断其他调用方共享的请求
+    return await asyncio.shield(task)
+
+
+async def _compute_layer_detail(layer_name: str, fields: Optional[set] = None) -> str:
+    """构建图层详细信息响应
+    
+    Args:
+        layer_name: 图层名称
+        fields: 需要返回的顶层字段集合，None表示全部字段
+        
+    Returns:
+        图层详细信息的JSON字符串
+    """
+    # 只有这些字段依赖远程服务的详细信息
+    needs_remote_details = fields is None or not fields.isdisjoint(REMOTE_DETAIL_FIELDS)
+    
     try:
         # 从数据库获取图层基础信息
-        db_manager = DatabaseManager()
-        repository = LayerResourceRepository(db_manager)
-        query = LayerResourceQuery(limit=10000)  # 获取所有图层
-        layers = await repository.list_resources(query)
+        repository = await get_layer_repository()
         
-        # 查找所有同名的图层记录（可能有不同的服务类型）
-        matching_layers = []
-        for layer in layers:
-            layer_dict = layer.to_dict()
-            if layer_dict.get('layer_name') == layer_name:
-                matching_layers.append(layer_dict)
+        # 查找所有同名的图层记录（可能有不同的服务类型），由layer_name索引完成过滤
+        matching_layers = [layer.to_dict() for layer in await repository.get_layers_by_name(layer_name)]
         
         if not matching_layers:
             # 提供可用图层的建议
-            available_layers = [layer.to_dict().get('layer_name') for layer in layers[:10]]
-            return json.dumps({
+            available_layers = await repository.list_layer_names(limit=10)
+            total_available = await repository.count(LayerResourceQuery())
+            return _dump_json({
                 "error": f"图层 '{layer_name}' 不存在",
                 "layer_name": layer_name,
                 "suggestions": available_layers,
-                "total_available": len(layers),
-                "note": "请使用精确的图层名称"
-            }, ensure_ascii=False, indent=2)
+                "total_available": total_available,
+                "note": "请使用精确的图层名称",
+                "_meta": _cache_meta(None, cacheable=False)
+            })
         
         logger.info(f"找到图层 {layer_name} 的 {len(matching_layers)} 个记录")
         
-        # 分析支持的服务类型
-        supports_wms = False
-        supports_wfs = False
-        supports_wmts = False
+        # 分析支持的服务类型（service_type入库时已由模型规范化为大写）
         service_records = {}
-        
         for layer_record in matching_layers:
-            service_type = layer_record['service_type'].upper()
-            if service_type == 'WMS':
-                supports_wms = True
-                service_records['WMS'] = layer_record
-            elif service_type == 'WFS':
-                supports_wfs = True
-                service_records['WFS'] = layer_record
-            elif service_type == 'WMTS':
-                supports_wmts = True
-                service_records['WMTS'] = layer_record
+            service_records[layer_record['service_type']] = layer_record
         
         # 使用第一个记录作为基础信息
         base_layer = matching_layers[0]
         
-        # 记录支持的服务类型
-        supported_types = []
-        if supports_wms:
-            supported_types.append('WMS')
-        if supports_wfs:
-            supported_types.append('WFS')
-        if supports_wmts:
-            supported_types.append('WMTS')
-        
-        logger.info(f"图层 {layer_name} 支持的服务类型: {', '.join(supported_types)}")
+        # 记录支持的服务类型（按WMS、WFS、WMTS的固定顺序）
+        supported_types, supported_types_text = _SUPPORTED_TYPES_TABLE[frozenset(service_records).intersection(SERVICE_TYPE_ORDER)]
+        supports_wms = 'WMS' in service_records
+        supports_wfs = 'WFS' in service_records
+        supports_wmts = 'WMTS' in service_records
         
-        # 获取OGC解析器
-        ogc_parser = await get_ogc_parser()
+        logger.info(f"图层 {layer_name} 支持的服务类型: {supported_types_text}")
         
         # 构建访问参数 - 使用layer_details.py获取详细信息
         access_parameters = {}
         detailed_capabilities = {}
         
-        # 为每个支持的服务类型获取详细信息
-        for service_type in supported_types:
-            if service_type in service_records:
-                layer_record = service_records[service_type]
-                service_url = layer_record['service_url']
+        # 为每个支持的服务类型获取详细信息（只请求基础信息时跳过远程访问）
+        fetch_types = supported_types if needs_remote_details else []
+        if fetch_types:
+            ogc_parser = await get_ogc_parser()
+            # 各服务类型的能力文档相互独立，并发获取（所有图层详情请求共享并发上限）
+            results = await asyncio.gather(*(
+                _fetch_service_details(ogc_parser, service_records[service_type]['service_url'], service_type, layer_name)
+                for service_type in fetch_types
+            ), return_exceptions=True)
+        else:
+            results = []
+        
+        # 按服务类型顺序合并结果，保证第一个可用的详细信息来源不变
+        for service_type, layer_details in zip(fetch_types, results):
+            try:
+                if isinstance(layer_details, BaseException):
+                    raise layer_details
+                
+                # 构建访问参数
+                service_access_params = await _build_access_parameters_from_details(layer_details, layer_name)
+                access_parameters.update(service_access_params)
+                
+                # 保存详细能力信息
+                detailed_capabilities[service_type.lower()] = layer_details
                 
-                try:
-                    # 使用layer_details.py获取详细信息
-                    layer_details = await ogc_parser.layer_details_parser.get_layer_details(
-                        service_url, service_type, layer_name, strict_mode=True
-                    )
-                    
-                    # 构建访问参数
-                    service_access_params = await _build_access_parameters_from_details(layer_details, layer_name)
-                    access_parameters.update(service_access_params)
-                    
-                    # 保存详细能力信息
-                    detailed_capabilities[service_type.lower()] = layer_details
-                    
-                    logger.info(f"成功获取 {service_type} 图层详细信息")
-                    
-                except Exception as e:
-                    logger.warning(f"获取 {service_type} 详细信息失败: {e}")
-                    # 提供基础的访问参数作为备选
-                    if service_type == 'WMS':
-                        access_parameters["wms"] = {
-                            "service": "WMS",
-                            "version": "1.3.0",
-                            "request": "GetMap",
-                            "layers": layer_name,
-                            "bbox": [-180, -90, 180, 90],
-                            "crs": "EPSG:4326",
-                            "width": 256,
-                            "height": 256,
-                            "format": "image/png",
-                            "styles": []
-                        }
-                    elif service_type == 'WFS':
-                        access_parameters["wfs"] = {
-                            "service": "WFS",
-                            "version": "2.0.0",
-                            "request": "GetFeature",
-                            "typeNames": layer_name,
-                            "srsName": "EPSG:4326",
-                            "bbox": [-180, -90, 180, 90],
-                            "maxFeatures": 1000,
-                            "outputFormat": "application/json"
-                        }
-                    elif service_type == 'WMTS':
-                        access_parameters["wmts"] = {
-                            "service": "WMTS",
-                            "version": "1.0.0",
-                            "request": "GetTile",
-                            "layer": layer_name,
-                            "style": "",
-                            "format": "image/png",
-                            "tilematrixset": "GoogleMapsCompatible",
-                            "tilematrix": "0",
-                            "tilerow": 0,
-                            "tilecol": 0
-                        }
+                logger.info(f"成功获取 {service_type} 图层详细信息")
+                
+            except Exception as e:
+                logger.warning(f"获取 {service_type} 详细信息失败: {e}")
+                # 提供基础的访问参数作为备选
+                fallback = _FALLBACK_ACCESS_PARAMETERS.get(service_type)
+                if fallback:
+                    key, name_field, params = fallback
+                    access_parameters[key] = {**params, name_field: layer_name}
         
         # 为不支持的服务类型明确标记
         if not supports_wms:
@@ -333,18 +668,12 @@ async def layer_detail(ctx: Context, layer_name: str) -> str:
         }
         
         # 如果有详细能力信息，使用第一个可用的
-        if detailed_capabilities:
-            first_detail = list(detailed_capabilities.values())[0]
-            if first_detail.get("bbox"):
-                combined_capabilities["bbox"] = first_detail["bbox"]
-            if first_detail.get("crs_list"):
-                combined_capabilities["crs_list"] = first_detail["crs_list"]
-            if first_detail.get("default_crs"):
-                combined_capabilities["default_crs"] = first_detail["default_crs"]
-            if first_detail.get("attributes"):
-                combined_capabilities["attributes"] = first_detail["attributes"]
-            if first_detail.get("geometry_type"):
-                combined_capabilities["geometry_type"] = first_detail["geometry_type"]
+        first_detail = next(iter(detailed_capabilities.values()), None)
+        if first_detail:
+            for capability_key in COMBINED_CAPABILITY_KEYS:
+                value = first_detail.get(capability_key)
+                if value:
+                    combined_capabilities[capability_key] = value
         
         # 构建图层详细信息
         layer_details_response = {
@@ -354,8 +683,8 @@ async def layer_detail(ctx: Context, layer_name: str) -> str:
                 "layer_name": base_layer['layer_name'],
                 "layer_title": base_layer.get('layer_title', layer_name),
                 "layer_abstract": base_layer.get('layer_abstract'),
-                "service_type": ', '.join(supported_types),
-                "detected_service_type": ', '.join(supported_types),
+                "service_type": supported_types_text,
+                "detected_service_type": supported_types_text,
                 "service_url": base_layer['service_url'],
                 "service_name": base_layer.get('service_name'),
                 "keywords": [],
@@ -369,7 +698,7 @@ async def layer_detail(ctx: Context, layer_name: str) -> str:
             "detailed_capabilities": detailed_capabilities,  # 新增：详细的服务能力信息
             "metadata": {
                 "source": "database_with_detailed_parsing",
-                "last_updated": datetime.now().isoformat(),
+                "last_updated": _now_iso(),
                 "ogc_compliant": True,
                 "primary_service": supported_types[0] if supported_types else "unknown",
                 "supported_services": supported_types,
@@ -381,11 +710,23 @@ async def layer_detail(ctx: Context, layer_name: str) -> str:
             }
         }
         
-        return json.dumps(layer_details_response, ensure_ascii=False, indent=2)
+        if fields is not None:
+            layer_details_response = {
+                key: value for key, value in layer_details_response.items()
+                if key == "layer_name" or key in fields
+            }
+        
+        # etag只覆盖图层内容，不包含metadata中的时间戳
+        layer_details_response["_meta"] = _cache_meta({
+            key: value for key, value in layer_details_response.items() if key != "metadata"
+        })
+        
+        return _dump_json(layer_details_response)
         
     except Exception as e:
         logger.error(f"获取图层详细信息失败: {e}")
-        return json.dumps({
+        return _dump_json({
             "error": f"获取图层详细信息失败: {str(e)}",
-            "layer_name": layer_name
-        }, ensure_ascii=False, indent=2)
+            "layer_name": layer_name,
+            "_meta": _cache_meta(None, cacheable=False)
+        })
@@ -5,55 +5,89 @@ OGC MCP服务器主模块
 支持服务器组合模式，将多个子服务器组合成一个完整的服务。
 """
 
+import asyncio
+import importlib
 import logging
 from contextlib import asynccontextmanager
+from typing import Optional
 from fastmcp import FastMCP
 
 from .database import init_database, close_database
 from .services.web_server.server import get_web_server, stop_web_server
 
-# 导入子服务器模块 - 在模块级别导入，确保模块定义可用
-from .tools.management_tools import management_server
-from .tools.visualization_tools import visualization_server
-from .tools.wms_layer_tool import wms_layer_server
-from .tools.wfs_layer_tool import wfs_layer_server
-from .tools.wmts_layer_tool import wmts_layer_server
-from .resources.layer_registry import layer_registry_server
-from .prompts.workflow_prompts import workflow_prompts_server
-from .prompts.registration_workflow_prompts import registration_workflow_server
 # 配置日志
 logger = logging.getLogger(__name__)
 
+# 子服务器名称 -> 所在模块
+# 子服务器在启动时才导入，导入本模块时不加载各工具模块及其依赖，缩短进程冷启动时间
+_SUB_SERVER_MODULES = {
+    "management_server": ".tools.management_tools",
+    "visualization_server": ".tools.visualization_tools",
+    "wms_layer_server": ".tools.wms_layer_tool",
+    "wfs_layer_server": ".tools.wfs_layer_tool",
+    "wmts_layer_server": ".tools.wmts_layer_tool",
+    "layer_registry_server": ".resources.layer_registry",
+    "workflow_prompts_server": ".prompts.workflow_prompts",
+    "registration_workflow_server": ".prompts.registration_workflow_prompts",
+}
+
+
+def __getattr__(name: str):
+    """按需加载子服务器，保持 `from ogc_mcp_server.server import management_server` 等用法可用"""
+    module_name = _SUB_SERVER_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name, __package__), name)
+
+
 # 全局标志，防止重复导入和重复清理
 _servers_imported = False
 _cleanup_done = False
+# 串行化清理过程：并发的重复调用等待正在进行的清理结束，而不是再次关闭同一批资源
+_cleanup_lock: Optional[asyncio.Lock] = None
+
+
+def _get_cleanup_lock() -> asyncio.Lock:
+    """获取清理锁（在事件循环中首次使用时创建）"""
+    global _cleanup_lock
+    if _cleanup_lock is None:
+        _cleanup_lock = asyncio.Lock()
+    return _cleanup_lock
 
 
 async def cleanup_resources():
-    """清理资源"""
-    global _cleanup_done
+    """清理资源
     
-    if _cleanup_done:
-        logger.info("资源已清理，跳过重复清理")
-        return
-    
-    logger.info("正在清理资源...")
+    可重复调用：清理成功后再次调用直接返回，清理进行中的并发调用会等待其完成
+    """
+    global _cleanup_done
     
-    try:
-        # 停止Web可视化服务器
-        logger.info("正在停止Web可视化服务器...")
-        await stop_web_server()
+    async with _get_cleanup_lock():
+        if _cleanup_done:
+            logger.info("资源已清理，跳过重复清理")
+            return
         
-        # 关闭数据库连接
-        logger.info("正在关闭数据库连接...")
-        await close_database()
-        logger.info("数据库连接已关闭")
+        logger.info("正在清理资源...")
         
-        _cleanup_done = True
-        logger.info("资源清理完成")
+        # Web可视化服务器和数据库连接互不依赖，并发关闭
+        # OGC解析器是模块级单例，生命周期可能再次启动，这里不关闭其共享的HTTP客户端
+        logger.info("正在停止Web可视化服务器并关闭数据库连接...")
+        steps = ("停止Web可视化服务器", "关闭数据库连接")
+        results = await asyncio.gather(
+            stop_web_server(),
+            close_database(),
+            return_exceptions=True
+        )
         
-    except Exception as e:
-        logger.error(f"资源清理过程中出现错误: {e}")
+        failed = False
+        for step, result in zip(steps, results):
+            if isinstance(result, BaseException):
+                failed = True
+                logger.error(f"资源清理过程中出现错误（{step}）: {result}")
+        
+        if not failed:
+            _cleanup_done = True
+            logger.info("资源清理完成")
 
 
 async def import_all_servers(app: FastMCP):
@@ -67,15 +101,32 @@ async def import_all_servers(app: FastMCP):
     logger.info("正在组合子服务器...")
     
     try:
-        # 异步导入各个子服务器的组件
-        await app.import_server(management_server, prefix="mgmt")        # 管理工具
-        await app.import_server(visualization_server, prefix="viz")     # 通用可视化工具
-        await app.import_server(wms_layer_server, prefix="wms")          # WMS图层工具
-        await app.import_server(wfs_layer_server, prefix="wfs")          # WFS图层工具
-        await app.import_server(wmts_layer_server, prefix="wmts")        # WMTS图层工具
-        await app.import_server(workflow_prompts_server, prefix="workflow")  # 工作流提示词
-        await app.import_server(registration_workflow_server, prefix="register")  # 注册工作流提示词        
-        await app.import_server(layer_registry_server)                 # 图层注册表资源（无前缀）
+        # 启动时才导入子服务器模块
+        from .tools.management_tools import management_server
+        from .tools.visualization_tools import visualization_server
+        from .tools.wms_layer_tool import wms_layer_server
+        from .tools.wfs_layer_tool import wfs_layer_server
+        from .tools.wmts_layer_tool import wmts_layer_server
+        from .resources.layer_registry import layer_registry_server
+        from .prompts.workflow_prompts import workflow_prompts_server
+        from .prompts.registration_workflow_prompts import registration_workflow_server
+        
+        # 各子服务器使用不同前缀，互不冲突，并发导入各个子服务器的组件
+        # 等待全部导入结束后再抛出第一个错误，避免失败后其他导入仍在后台注册组件
+        results = await asyncio.gather(
+            app.import_server(management_server, prefix="mgmt"),        # 管理工具
+            app.import_server(visualization_server, prefix="viz"),      # 通用可视化工具
+            app.import_server(wms_layer_server, prefix="wms"),          # WMS图层工具
+            app.import_server(wfs_layer_server, prefix="wfs"),          # WFS图层工具
+            app.import_server(wmts_layer_server, prefix="wmts"),        # WMTS图层工具
+            app.import_server(workflow_prompts_server, prefix="workflow"),  # 工作流提示词
+            app.import_server(registration_workflow_server, prefix="register"),  # 注册工作流提示词
+            app.import_server(layer_registry_server),                   # 图层注册表资源（无前缀）
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
         
         _servers_imported = True
         
@@ -4,12 +4,31 @@
 提供OGC服务相关的业务逻辑
 """
 
-from .layer_service import register_ogc_layers
-from .ogc_parser import OGCServiceParser, ogc_parser, get_ogc_parser
+import importlib
+
+# 导出名称 -> (所在模块, 模块中的属性名)，首次访问时才导入，避免导入web_server等子包时连带加载OGC解析器
+# 子包ogc_parser一经导入就会以同名属性绑定到本包上，__getattr__不再被调用，
+# 因此全局解析器实例以default_ogc_parser导出，不与子包同名
+_LAZY_EXPORTS = {
+    'register_ogc_layers': ('.layer_service', 'register_ogc_layers'),
+    'OGCServiceParser': ('.ogc_parser', 'OGCServiceParser'),
+    'default_ogc_parser': ('.ogc_parser', 'ogc_parser'),
+    'get_ogc_parser': ('.ogc_parser', 'get_ogc_parser'),
+}
+
+
+def __getattr__(name: str):
+    """按需导入导出的服务对象"""
+    export = _LAZY_EXPORTS.get(name)
+    if export is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr_name = export
+    return getattr(importlib.import_module(module_name, __name__), attr_name)
+
 
 __all__ = [
     'register_ogc_layers',
     'OGCServiceParser', 
-    'ogc_parser', 
+    'default_ogc_parser', 
     'get_ogc_parser'
 ]
\ No newline at end of file
@@ -86,6 +86,10 @@ async def register_ogc_layers(
             
             total_layers += len(parsed_layers)
             
+            # 服务已重新解析，丢弃该服务缓存的能力文档和图层详情
+            for parsed_service_url in {layer.service_url for layer in parsed_layers}:
+                parser.layer_details_parser.invalidate(parsed_service_url)
+            
             # 获取当前数据库中该服务的所有图层
             existing_layers = await repository.get_layers_by_service_url(url)
             
@@ -99,64 +103,91 @@ async def register_ogc_layers(
             # 创建解析到的图层集合（按图层名称）
             parsed_layer_names = set(parsed_layers_by_name.keys())
             
-            # 处理每个图层名称
+            # 按(图层名称, 服务类型)索引已存在的图层
+            existing_by_key = {
+                (existing.layer_name, existing.service_type): existing
+                for existing in existing_layers
+            }
+            
+            # 处理每个图层名称，收集需要新建的图层
+            pending_layers = []
             for layer_name, layer_variants in parsed_layers_by_name.items():
-                try:
-                    # 为每个服务类型创建独立的图层记录，不再合并
-                    for layer_variant in layer_variants:
-                        # 检查该图层是否已存在（按service_url、layer_name和service_type查找）
-                        existing_layer = None
-                        for existing in existing_layers:
-                            if (existing.layer_name == layer_name and 
-                                existing.service_type == layer_variant.service_type):
-                                existing_layer = existing
-                                break
-                        
-                        if existing_layer:
-                            # 图层已存在，跳过
-                            skipped_layers += 1
-                            service_result["layers"].append({
-                                "name": layer_name,
-                                "type": layer_variant.service_type,
-                                "status": "skipped",
-                                "reason": "already_exists",
-                                "resource_id": existing_layer.resource_id
-                            })
-                            logger.info(f"图层已存在，跳过: {layer_name} ({layer_variant.service_type})")
-                        else:
-                            # 创建新图层资源
-                            new_layer = LayerResourceCreate(
+                # 为每个服务类型创建独立的图层记录，不再合并
+                for layer_variant in layer_variants:
+                    existing_layer = existing_by_key.get((layer_name, layer_variant.service_type))
+                    
+                    if existing_layer:
+                        # 图层已存在，跳过
+                        skipped_layers += 1
+                        service_result["layers"].append({
+                            "name": layer_name,
+                            "type": layer_variant.service_type,
+                            "status": "skipped",
+                            "reason": "already_exists",
+                            "resource_id": existing_layer.resource_id
+                        })
+                        logger.info(f"图层已存在，跳过: {layer_name} ({layer_variant.service_type})")
+                    else:
+                        try:
+                            pending_layers.append(LayerResourceCreate(
                                 service_name=layer_variant.service_name,
                                 service_url=layer_variant.service_url,
                                 service_type=layer_variant.service_type,
                                 layer_name=layer_variant.layer_name,
                                 layer_title=layer_variant.layer_title,
                                 layer_abstract=layer_variant.layer_abstract
-                            )
-                            
-                            created_layer = await repository.create(new_layer)
-                            successful_layers += 1
+                            ))
+                        except Exception as e:
+                            # 单个图层数据无效时只记录该图层失败，不影响同一服务的其他图层
+                            failed_layers += 1
+                            error_msg = f"处理图层失败 {layer_name} ({layer_variant.service_type}): {e}"
+                            logger.error(error_msg)
                             
                             service_result["layers"].append({
                                 "name": layer_name,
                                 "type": layer_variant.service_type,
-                                "status": "created",
-                                "resource_id": created_layer.resource_id
+                                "status": "failed",
+                                "error": str(e)
                             })
                             
-                            logger.info(f"图层注册成功: {layer_name} ({layer_variant.service_type})")
+                            results["errors"].append(error_msg)
+            
+            # 批量创建新图层资源（一个事务）
+            if pending_layers:
+                try:
+                    for layer_resource, created in await repository.create_many(pending_layers):
+                        if created:
+                            successful_layers += 1
+                            service_result["layers"].append({
+                                "name": layer_resource.layer_name,
+                                "type": layer_resource.service_type,
+                                "status": "created",
+                                "resource_id": layer_resource.resource_id
+                            })
+                            logger.info(f"图层注册成功: {layer_resource.layer_name} ({layer_resource.service_type})")
+                        else:
+                            # 被唯一约束忽略的图层（已由其他记录注册），返回已有记录的ID
+                            skipped_layers += 1
+                            service_result["layers"].append({
+                                "name": layer_resource.layer_name,
+                                "type": layer_resource.service_type,
+                                "status": "skipped",
+                                "reason": "already_exists",
+                                "resource_id": layer_resource.resource_id
+                            })
                     
                 except Exception as e:
-                    failed_layers += 1
-                    error_msg = f"处理图层失败 {layer_name}: {e}"
+                    failed_layers += len(pending_layers)
+                    error_msg = f"批量创建图层失败 ({len(pending_layers)} 个): {e}"
                     logger.error(error_msg)
                     
-                    service_result["layers"].append({
-                        "name": layer_name,
-                        "type": "unknown",
-                        "status": "failed",
-                        "error": str(e)
-                    })
+                    for pending_layer in pending_layers:
+                        service_result["layers"].append({
+                            "name": pending_layer.layer_name,
+                            "type": pending_layer.service_type,
+                            "status": "failed",
+                            "error": str(e)
+                        })
                     
                     results["errors"].append(error_msg)
             
@@ -257,25 +288,11 @@ async def list_registered_layers(
             offset=offset
         )
         
-        # 查询图层资源
-        layers = await repository.list_resources(query)
-        total_count = await repository.count(query)
+        # 查询图层资源（分页结果和总数在同一次查询中获得）
+        layers, total_count = await repository.list_with_total(query)
         
-        # 转换为字典格式（只包含基础元数据）
-        layer_list = []
-        for layer in layers:
-            layer_dict = {
-                "resource_id": layer.resource_id,
-                "service_name": layer.service_name,
-                "service_url": layer.service_url,
-                "service_type": layer.service_type,
-                "layer_name": layer.layer_name,
-                "layer_title": layer.layer_title,
-                "layer_abstract": layer.layer_abstract,
-                "created_at": layer.created_at.isoformat(),
-                "updated_at": layer.updated_at.isoformat()
-            }
-            layer_list.append(layer_dict)
+        # 转换为字典格式（只包含基础元数据），时间字段由pydantic-core直接格式化为ISO字符串
+        layer_list = [layer.to_dict() for layer in layers]
         
         result = {
             "layers": layer_list,
@@ -507,35 +524,14 @@ async def get_layer_statistics(ctx: Context = None) -> Dict[str, Any]:
         # 获取仓储
         repository = await get_layer_repository()
         
-        # 获取总数统计
-        from ..database.models import LayerResourceQuery
-        total_query = LayerResourceQuery()
-        total_count = await repository.count(total_query)
-        
-        # 按服务类型统计
-        wms_query = LayerResourceQuery(service_type="WMS")
-        wms_count = await repository.count(wms_query)
+        # 总数和按服务类型统计（一次分组查询）
+        type_counts = await repository.count_by_service_type()
+        total_count = type_counts['total']
+        wms_count = type_counts.get("WMS", 0)
+        wfs_count = type_counts.get("WFS", 0)
         
-        wfs_query = LayerResourceQuery(service_type="WFS")
-        wfs_count = await repository.count(wfs_query)
-        
-        # 获取所有图层用于详细统计
-        all_layers = await repository.list_resources(LayerResourceQuery(limit=10000))
-        
-        # 按服务名称统计
-        service_stats = {}
-        
-        for layer in all_layers:
-            # 服务统计
-            service_key = f"{layer.service_name} ({layer.service_type})"
-            if service_key not in service_stats:
-                service_stats[service_key] = {
-                    "service_name": layer.service_name,
-                    "service_type": layer.service_type,
-                    "service_url": layer.service_url,
-                    "layer_count": 0
-                }
-            service_stats[service_key]["layer_count"] += 1
+        # 按服务名称统计（分组计数在SQL中完成）
+        service_stats = await repository.count_by_service()
         
         # 构建统计结果
         result = {
@@ -544,9 +540,9 @@ async def get_layer_statistics(ctx: Context = None) -> Dict[str, Any]:
                 "WMS": wms_count,
                 "WFS": wfs_count
             },
-            "service_statistics": list(service_stats.values()),
+            "service_statistics": service_stats,
             "top_services": sorted(
-                service_stats.values(), 
+                service_stats, 
                 key=lambda x: x["layer_count"], 
                 reverse=True
             )[:10]
@@ -8,6 +8,8 @@ import logging
 import re
 from typing import List, Dict, Any
 
+import httpx
+
 from .url_utils import URLUtils
 from .wfs_schema import WFSSchemaParser
 from .bbox_utils import BBoxUtils
@@ -17,6 +19,11 @@ from .filter_builder import WFSFilterBuilder
 
 logger = logging.getLogger(__name__)
 
+# 共享HTTP客户端的连接池配置
+HTTP_MAX_CONNECTIONS = 50
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+HTTP_KEEPALIVE_EXPIRY = 60.0
+
 
 class OGCServiceParser:
     """OGC服务解析器
@@ -32,11 +39,21 @@ class OGCServiceParser:
         """
         self.timeout = timeout
         
+        # 各工具模块共享同一个HTTP客户端，复用到同一服务的keep-alive连接
+        self.http_client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+            )
+        )
+        
         # 初始化各个工具模块
-        self.url_utils = URLUtils(timeout)
-        self.wfs_schema_parser = WFSSchemaParser(self.url_utils, timeout)
-        self.bbox_utils = BBoxUtils(self.url_utils, timeout)
-        self.capabilities_parser = CapabilitiesParser(self.url_utils, timeout)
+        self.url_utils = URLUtils(timeout, self.http_client)
+        self.wfs_schema_parser = WFSSchemaParser(self.url_utils, timeout, self.http_client)
+        self.bbox_utils = BBoxUtils(self.url_utils, timeout, self.http_client)
+        self.capabilities_parser = CapabilitiesParser(self.url_utils, timeout, self.http_client)
         self.layer_details_parser = LayerDetailsParser(
             self.url_utils, 
             self.bbox_utils, 
@@ -46,10 +63,16 @@ class OGCServiceParser:
         self.filter_builder = WFSFilterBuilder()
     
     async def close(self):
-        """关闭所有HTTP客户端"""
+        """关闭所有HTTP客户端
+        
+        各工具模块只关闭自行创建的客户端，共享的HTTP客户端由解析器在此关闭；
+        关闭后解析器不能再发起请求，只应在进程退出前调用
+        """
         await self.url_utils.close()
         await self.wfs_schema_parser.close()
         await self.bbox_utils.close()
+        await self.capabilities_parser.close()
+        await self.http_client.aclose()
     
     # 过滤器构建方法（委托给filter_builder）
     def create_filter_builder(self) -> WFSFilterBuilder:
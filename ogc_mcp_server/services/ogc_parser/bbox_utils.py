@@ -15,20 +15,23 @@ logger = logging.getLogger(__name__)
 class BBoxUtils:
     """边界框处理工具类"""
     
-    def __init__(self, url_utils, timeout: int = 30):
+    def __init__(self, url_utils, timeout: int = 30, http_client: Optional[httpx.AsyncClient] = None):
         """初始化边界框工具
         
         Args:
             url_utils: URL工具实例
             timeout: HTTP请求超时时间（秒）
+            http_client: 共享的HTTP客户端，不提供时自行创建
         """
         self.url_utils = url_utils
         self.timeout = timeout
-        self.http_client = httpx.AsyncClient(timeout=timeout)
+        self._owns_http_client = http_client is None
+        self.http_client = http_client or httpx.AsyncClient(timeout=timeout)
     
     async def close(self):
         """关闭HTTP客户端"""
-        await self.http_client.aclose()
+        if self._owns_http_client:
+            await self.http_client.aclose()
     
     async def get_dynamic_bbox_from_data(self, service_url: str, service_type: str, layer_name: str) -> Optional[Dict[str, Any]]:
         """通过实际数据获取动态边界框
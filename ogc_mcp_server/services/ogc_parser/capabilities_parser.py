@@ -6,6 +6,7 @@ OGC服务能力文档解析模块
 
 import logging
 from typing import List, Dict, Any, Optional
+import httpx
 from owslib.wms import WebMapService
 from owslib.wfs import WebFeatureService
 from owslib.wmts import WebMapTileService
@@ -19,15 +20,23 @@ logger = logging.getLogger(__name__)
 class CapabilitiesParser:
     """能力文档解析器"""
     
-    def __init__(self, url_utils, timeout: int = 30):
+    def __init__(self, url_utils, timeout: int = 30, http_client: Optional[httpx.AsyncClient] = None):
         """初始化能力文档解析器
         
         Args:
             url_utils: URL工具实例
             timeout: HTTP请求超时时间（秒）
+            http_client: 共享的HTTP客户端，不提供时自行创建
         """
         self.url_utils = url_utils
         self.timeout = timeout
+        self._owns_http_client = http_client is None
+        self.http_client = http_client or httpx.AsyncClient(timeout=timeout)
+    
+    async def close(self):
+        """关闭HTTP客户端"""
+        if self._owns_http_client:
+            await self.http_client.aclose()
     
     def _generate_service_name(self, service_obj, url: str, default_title: str) -> str:
         """生成服务名称
@@ -102,22 +111,20 @@ class CapabilitiesParser:
             # 添加预检查机制
             try:
                 # 先测试URL是否可访问
-                import httpx
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.get(capabilities_url)
-                    if response.status_code != 200:
-                        raise ValueError(f"WMS服务返回错误状态码: {response.status_code}")
-                    
-                    # 检查响应内容
-                    content = response.text
-                    if not content or 'capabilities' not in content.lower():
-                        raise ValueError("响应内容不包含有效的WMS能力文档")
-                    
-                    # 检查是否是WMTS服务被误用
-                    if 'wmts' in content.lower() and 'wms' not in content.lower():
-                        raise ValueError("检测到WMTS服务，但请求的是WMS能力文档")
-                    
-                    logger.debug(f"WMS能力文档长度: {len(content)} 字符")
+                response = await self.http_client.get(capabilities_url)
+                if response.status_code != 200:
+                    raise ValueError(f"WMS服务返回错误状态码: {response.status_code}")
+                
+                # 检查响应内容
+                content = response.text
+                if not content or 'capabilities' not in content.lower():
+                    raise ValueError("响应内容不包含有效的WMS能力文档")
+                
+                # 检查是否是WMTS服务被误用
+                if 'wmts' in content.lower() and 'wms' not in content.lower():
+                    raise ValueError("检测到WMTS服务，但请求的是WMS能力文档")
+                
+                logger.debug(f"WMS能力文档长度: {len(content)} 字符")
                     
             except Exception as e:
                 logger.error(f"WMS服务访问测试失败: {e}")
@@ -277,18 +284,16 @@ class CapabilitiesParser:
             # 添加预检查机制
             try:
                 # 先测试URL是否可访问
-                import httpx
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.get(capabilities_url)
-                    if response.status_code != 200:
-                        raise ValueError(f"WMTS服务返回错误状态码: {response.status_code}")
-                    
-                    # 检查响应内容
-                    content = response.text
-                    if not content or 'capabilities' not in content.lower():
-                        raise ValueError("响应内容不包含有效的WMTS能力文档")
-                    
-                    logger.debug(f"WMTS能力文档长度: {len(content)} 字符")
+                response = await self.http_client.get(capabilities_url)
+                if response.status_code != 200:
+                    raise ValueError(f"WMTS服务返回错误状态码: {response.status_code}")
+                
+                # 检查响应内容
+                content = response.text
+                if not content or 'capabilities' not in content.lower():
+                    raise ValueError("响应内容不包含有效的WMTS能力文档")
+                
+                logger.debug(f"WMTS能力文档长度: {len(content)} 字符")
                     
             except Exception as e:
                 logger.error(f"WMTS服务访问测试失败: {e}")
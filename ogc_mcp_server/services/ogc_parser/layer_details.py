@@ -4,9 +4,13 @@
 负责获取WMS、WFS和WMTS图层的详细信息
 """
 
+import asyncio
+import copy
+import functools
 import logging
 import re
-from typing import Dict, Any, List
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
 from owslib.wms import WebMapService
 from owslib.wfs import WebFeatureService
 from owslib.wmts import WebMapTileService
@@ -14,6 +18,79 @@ from owslib.util import ServiceException
 
 logger = logging.getLogger(__name__)
 
+# 图层详细信息缓存有效期（秒）及最大条目数
+LAYER_DETAILS_CACHE_TTL = 300.0
+LAYER_DETAILS_CACHE_MAX_SIZE = 512
+
+# 已解析能力文档缓存有效期（秒）及最大条目数（单个文档可能很大，条目数保持较小）
+CAPABILITIES_CACHE_TTL = 300.0
+CAPABILITIES_CACHE_MAX_SIZE = 32
+
+
+class _AsyncTTLCache:
+    """带有效期的异步结果缓存
+    
+    缓存未命中时相同键的并发调用共享同一个任务，只有成功结果会被缓存
+    """
+    
+    def __init__(self, ttl: float, max_size: int):
+        """初始化缓存
+        
+        Args:
+            ttl: 缓存有效期（秒）
+            max_size: 最大条目数，超出时淘汰最早写入的条目
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        # 键 -> (过期时间, 结果)
+        self._entries: Dict[Tuple, Tuple[float, Any]] = {}
+        # 正在进行的请求：键 -> 任务
+        self._inflight: Dict[Tuple, asyncio.Task] = {}
+    
+    async def get_or_fetch(self, key: Tuple, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """返回缓存结果，未命中时调用fetch获取
+        
+        Args:
+            key: 缓存键
+            fetch: 无参数的协程函数，返回需要缓存的结果
+            
+        Returns:
+            缓存或新获取的结果
+        """
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._on_fetched(key, done))
+        
+        # shield避免单个调用方被取消时中断其他调用方共享的请求
+        return await asyncio.shield(task)
+    
+    def _on_fetched(self, key: Tuple, task: asyncio.Task) -> None:
+        """请求完成回调：移除进行中标记，成功结果写入缓存"""
+        if self._inflight.get(key) is not task:
+            # 请求期间缓存已失效，结果不再写入
+            return
+        del self._inflight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.max_size:
+            # 淘汰最早写入的条目
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (time.monotonic() + self.ttl, task.result())
+    
+    def invalidate(self, service_url: str) -> None:
+        """使指定服务URL的所有缓存条目失效（键的第一个元素为服务URL）"""
+        for entries in (self._entries, self._inflight):
+            for key in [key for key in entries if key[0] == service_url]:
+                del entries[key]
+
 
 class LayerDetailsParser:
     """图层详细信息解析器"""
@@ -31,6 +108,51 @@ class LayerDetailsParser:
         self.bbox_utils = bbox_utils
         self.wfs_schema_parser = wfs_schema_parser
         self.timeout = timeout
+        # 图层详细信息缓存：(服务URL, 服务类型, 图层名称, 严格模式) -> 详细信息
+        self._details_cache = _AsyncTTLCache(LAYER_DETAILS_CACHE_TTL, LAYER_DETAILS_CACHE_MAX_SIZE)
+        # 已解析的能力文档缓存：(服务URL, 服务类型) -> (可用端点URL, OWSLib服务对象)
+        self._capabilities_cache = _AsyncTTLCache(CAPABILITIES_CACHE_TTL, CAPABILITIES_CACHE_MAX_SIZE)
+    
+    def invalidate(self, service_url: str) -> None:
+        """使指定服务的能力文档和图层详细信息缓存失效
+        
+        服务重新注册后调用，保证后续详情请求读取最新的能力文档
+        
+        Args:
+            service_url: 服务URL
+        """
+        self._details_cache.invalidate(service_url)
+        self._capabilities_cache.invalidate(service_url)
+    
+    async def _get_capabilities(self, service_url: str, service_type: str, service_class) -> Tuple[str, Any]:
+        """获取已解析的能力文档（带缓存）
+        
+        同一服务的不同图层共享一次端点发现、下载和解析
+        
+        Args:
+            service_url: 服务URL（标准化的基础URL）
+            service_type: 服务类型（WMS/WFS/WMTS）
+            service_class: OWSLib服务类
+            
+        Returns:
+            (可用端点URL, OWSLib服务对象)
+        """
+        async def fetch() -> Tuple[str, Any]:
+            # 从标准化的URL重新发现可用端点，发现失败时直接使用标准化URL
+            working_url = await self.url_utils.find_working_endpoint(service_url, service_type)
+            if not working_url:
+                working_url = service_url
+            
+            # 构建能力文档URL
+            capabilities_url = self.url_utils.build_capabilities_url(working_url, service_type)
+            
+            # 下载和解析能力文档在工作线程中执行，不阻塞事件循环
+            service = await asyncio.get_running_loop().run_in_executor(
+                None, functools.partial(service_class, capabilities_url, timeout=self.timeout)
+            )
+            return working_url, service
+        
+        return await self._capabilities_cache.get_or_fetch((service_url, service_type), fetch)
     
     def _normalize_crs(self, crs_obj) -> str:
         """将CRS对象标准化为字符串格式
@@ -102,7 +224,30 @@ class LayerDetailsParser:
         return details
 
     async def get_layer_details(self, service_url: str, service_type: str, layer_name: str, strict_mode: bool = False) -> Dict[str, Any]:
-        """获取图层详细信息
+        """获取图层详细信息（带缓存）
+        
+        成功结果按(服务URL, 服务类型, 图层名称, 严格模式)缓存一段时间；
+        缓存未命中时相同键的并发调用只发起一次远程请求，共享同一结果。
+        每次返回缓存结果的深拷贝，调用方修改返回值不会影响缓存
+        
+        Args:
+            service_url: 服务URL（标准化的基础URL）
+            service_type: 服务类型（WMS/WFS/WMTS）
+            layer_name: 图层名称
+            strict_mode: 严格模式，如果为True则不尝试备选服务类型
+            
+        Returns:
+            图层详细信息字典
+        """
+        key = (service_url, service_type.upper(), layer_name, strict_mode)
+        details = await self._details_cache.get_or_fetch(
+            key,
+            lambda: self._fetch_layer_details(service_url, service_type, layer_name, strict_mode)
+        )
+        return copy.deepcopy(details)
+    
+    async def _fetch_layer_details(self, service_url: str, service_type: str, layer_name: str, strict_mode: bool = False) -> Dict[str, Any]:
+        """从远程服务获取图层详细信息
         
         支持WMS、WFS和WMTS类型的图层
         如果指定的服务类型失败，会尝试另一种服务类型作为备选（除非启用严格模式）
@@ -178,16 +323,8 @@ class LayerDetailsParser:
         Returns:
             WMTS图层详细信息
         """
-        # 从标准化的URL重新发现可用端点
-        working_url = await self.url_utils.find_working_endpoint(service_url, 'WMTS')
-        if not working_url:
-            working_url = service_url
-        
-        # 构建能力文档URL
-        capabilities_url = self.url_utils.build_capabilities_url(working_url, 'WMTS')
-        
-        # 创建WMTS服务对象
-        wmts = WebMapTileService(capabilities_url, timeout=self.timeout)
+        # 获取已解析的能力文档（同一服务的图层共享缓存）
+        working_url, wmts = await self._get_capabilities(service_url, 'WMTS', WebMapTileService)
         
         # 查找指定图层
         if layer_name not in wmts.contents:
@@ -566,17 +703,8 @@ class LayerDetailsParser:
         Returns:
             WMS图层详细信息
         """
-        # 从标准化的URL重新发现可用端点
-        working_url = await self.url_utils.find_working_endpoint(service_url, 'WMS')
-        if not working_url:
-            # 如果发现失败，尝试直接使用标准化URL构建能力文档URL
-            working_url = service_url
-        
-        # 构建能力文档URL
-        capabilities_url = self.url_utils.build_capabilities_url(working_url, 'WMS')
-        
-        # 创建WMS服务对象
-        wms = WebMapService(capabilities_url, timeout=self.timeout)
+        # 获取已解析的能力文档（同一服务的图层共享缓存）
+        working_url, wms = await self._get_capabilities(service_url, 'WMS', WebMapService)
         
         # 查找指定图层
         if layer_name not in wms.contents:
@@ -660,17 +788,8 @@ class LayerDetailsParser:
         Returns:
             WFS图层详细信息
         """
-        # 从标准化的URL重新发现可用端点
-        working_url = await self.url_utils.find_working_endpoint(service_url, 'WFS')
-        if not working_url:
-            # 如果发现失败，尝试直接使用标准化URL构建能力文档URL
-            working_url = service_url
-        
-        # 构建能力文档URL
-        capabilities_url = self.url_utils.build_capabilities_url(working_url, 'WFS')
-        
-        # 创建WFS服务对象
-        wfs = WebFeatureService(capabilities_url, timeout=self.timeout)
+        # 获取已解析的能力文档（同一服务的图层共享缓存）
+        working_url, wfs = await self._get_capabilities(service_url, 'WFS', WebFeatureService)
         
         # 查找指定要素类型
         if layer_name not in wfs.contents:
@@ -5,12 +5,19 @@ URL处理工具模块
 """
 
 import logging
+import re
 from typing import Optional
 from urllib.parse import urlparse, parse_qs, urlunparse
 import httpx
 
 logger = logging.getLogger(__name__)
 
+# URL路径中可识别的服务软件名称，按优先级排列
+KNOWN_SERVICES = ('geoserver', 'mapserver', 'qgis', 'arcgis')
+
+# 一次正则扫描找出路径中出现的所有已知服务名称
+KNOWN_SERVICE_RE = re.compile("|".join(KNOWN_SERVICES), re.IGNORECASE)
+
 
 class URLUtils:
     """URL处理工具类"""
@@ -32,18 +39,21 @@ class URLUtils:
         '',               # 原始URL（可能已经包含端点）
     ]
     
-    def __init__(self, timeout: int = 30):
+    def __init__(self, timeout: int = 30, http_client: Optional[httpx.AsyncClient] = None):
         """初始化URL工具
         
         Args:
             timeout: HTTP请求超时时间（秒）
+            http_client: 共享的HTTP客户端，不提供时自行创建
         """
         self.timeout = timeout
-        self.http_client = httpx.AsyncClient(timeout=timeout)
+        self._owns_http_client = http_client is None
+        self.http_client = http_client or httpx.AsyncClient(timeout=timeout)
     
     async def close(self):
         """关闭HTTP客户端"""
-        await self.http_client.aclose()
+        if self._owns_http_client:
+            await self.http_client.aclose()
     
     def extract_service_name_from_url(self, url: str) -> str:
         """从URL中提取服务名称
@@ -69,10 +79,10 @@ class URLUtils:
             path = parsed.path.strip('/')
             
             # 如果路径包含已知的服务名称，优先使用
-            known_services = ['geoserver', 'mapserver', 'qgis', 'arcgis']
-            for service in known_services:
-                if service in path.lower():
-                    return service
+            # 路径中同时出现多个名称时，按KNOWN_SERVICES的优先级而不是出现位置选择
+            found = {match.group(0).lower() for match in KNOWN_SERVICE_RE.finditer(path)}
+            if found:
+                return min(found, key=KNOWN_SERVICES.index)
             
             # 处理localhost情况
             if hostname and hostname.lower() in ['localhost', '127.0.0.1']:
@@ -7,7 +7,7 @@ WFS要素模式获取模块
 import logging
 import json
 import xml.etree.ElementTree as ET
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import httpx
 
 logger = logging.getLogger(__name__)
@@ -16,20 +16,23 @@ logger = logging.getLogger(__name__)
 class WFSSchemaParser:
     """WFS模式解析器"""
     
-    def __init__(self, url_utils, timeout: int = 30):
+    def __init__(self, url_utils, timeout: int = 30, http_client: Optional[httpx.AsyncClient] = None):
         """初始化WFS模式解析器
         
         Args:
             url_utils: URL工具实例
             timeout: HTTP请求超时时间（秒）
+            http_client: 共享的HTTP客户端，不提供时自行创建
         """
         self.url_utils = url_utils
         self.timeout = timeout
-        self.http_client = httpx.AsyncClient(timeout=timeout)
+        self._owns_http_client = http_client is None
+        self.http_client = http_client or httpx.AsyncClient(timeout=timeout)
     
     async def close(self):
         """关闭HTTP客户端"""
-        await self.http_client.aclose()
+        if self._owns_http_client:
+            await self.http_client.aclose()
     
     async def get_wfs_feature_schema(self, service_url: str, layer_name: str) -> Dict[str, Any]:
         """获取WFS要素类型的详细模式信息（DescribeFeatureType）
@@ -249,7 +249,7 @@ class WebVisualizationServer:
             "map_config": map_config,
             "html_file": html_path,
             "url": f"{self._get_base_url()}/{viz_id}.html",
-            "created_at": asyncio.get_event_loop().time()
+            "created_at": time.time()
         }
         
         # 更新首页
@@ -293,7 +293,7 @@ class WebVisualizationServer:
             "map_config": map_config,
             "html_file": html_path,
             "url": f"{self._get_base_url()}/{viz_id}.html",
-            "created_at": asyncio.get_event_loop().time()
+            "created_at": time.time()
         }
         
         # 更新首页
@@ -726,7 +726,8 @@ async def stop_web_server():
     global _web_server_instance
     
     if _web_server_instance:
-        _web_server_instance.stop()
-        # 移除异步等待，避免阻塞ASGI响应
+        web_server = _web_server_instance
         _web_server_instance = None
+        # HTTPServer.shutdown()会阻塞到服务线程退出，放到线程中执行，不阻塞事件循环和其他清理步骤
+        await asyncio.get_running_loop().run_in_executor(None, web_server.stop)
         logger.info("Web服务器实例已清理")
\ No newline at end of file
@@ -51,10 +51,12 @@ def main():
     
     try:
         # 使用uvicorn启动服务器，让uvicorn处理所有信号和退出逻辑
+        # loop="auto"：已安装uvloop时使用uvloop事件循环，否则使用默认asyncio事件循环
         uvicorn.run(
             http_app,
             host=host,
             port=port,
+            loop="auto",
             log_level="info"
         )
     finally: